@@ -83,16 +83,20 @@ def plot_write_tvb_results(tvb_results, simulator, transient=0.0, spiking_nodes_
     plotter, figsize, writer = _initialize(config, plotter, writer)
 
     time_with_transient = tvb_results[0][0]
+    time = time_with_transient
+    data = tvb_results[0][1]
+    if transient:
+        # Drop the transient from the raw (sorted in time) arrays, before building the time series:
+        i_start = np.searchsorted(time_with_transient, transient)
+        time = time[i_start:]
+        data = data[i_start:]
     source_ts = TimeSeriesXarray(  # substitute with TimeSeriesRegion fot TVB like functionality
-        data=tvb_results[0][1], time=time_with_transient,
+        data=data, time=time,
         connectivity=simulator.connectivity,
         labels_ordering=["Time", tvb_state_variable_type_label, "Region", "Neurons"],
         labels_dimensions={tvb_state_variable_type_label: list(tvb_state_variables_labels),
                            "Region": simulator.connectivity.region_labels.tolist()},
         sample_period=simulator.integrator.dt)
-
-    if transient:
-        source_ts = source_ts[transient:]
     time = source_ts.time
 
     if writer is not None:
@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
+import os
 import time
+import hashlib
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -15,10 +20,59 @@ from tvb_multiscale.core.plot.plotter import Plotter
 from examples.tvb_nest.example import results_path_fun
 from examples.plot_write_results import plot_write_results
 
+from tvb.contrib.scripts.utils.file_utils import safe_makedirs
 from tvb.datatypes.connectivity import Connectivity
 from tvb.simulator.models.reduced_wong_wang_exc_io import ReducedWongWangExcIO
 
 
+def _is_cache_up_to_date(cache_path, source_path):
+    # A cache file is valid only if it exists and it has been modified after its source file:
+    return os.path.isfile(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path)
+
+
+def _load_conn(path, cache_dir, **loadtxt_kwargs):
+    # Parse the text file only once (and again whenever it changes) and cache it as a .npy file in cache_dir,
+    # which is memory-mapped (copy-on-write) on every subsequent load:
+    npy_path = os.path.join(cache_dir, os.path.basename(path) + ".npy")
+    if not _is_cache_up_to_date(npy_path, path):
+        np.save(npy_path, np.loadtxt(path, **loadtxt_kwargs))
+    return np.load(npy_path, mmap_mode="c")
+
+
+def _load_centres(path, cache_dir):
+    # The centres file holds the region labels in the first column and the centres' coordinates in the next ones.
+    # Parse it only once (and again whenever it changes) and cache labels and centres separately as .npy files:
+    cache_path = os.path.join(cache_dir, os.path.basename(path))
+    centres_path = cache_path + ".centres.npy"
+    labels_path = cache_path + ".labels.npy"
+    if not (_is_cache_up_to_date(centres_path, path) and _is_cache_up_to_date(labels_path, path)):
+        import pandas as pd
+        centres = pd.read_csv(path, sep=r"\s+", header=None, engine="c")
+        np.save(labels_path, centres.iloc[:, 0].to_numpy(dtype="str"))
+        np.save(centres_path, centres.iloc[:, 1:3].to_numpy(dtype="f8"))
+    return np.load(centres_path, mmap_mode="c"), np.load(labels_path)
+
+
+def _cached_connectivity(cache_dir, **connectivity_kwargs):
+    # Pickle the Connectivity, keyed by a hash of its input arrays, so that repeated runs (e.g., parameter sweeps)
+    # reuse it instead of reconstructing it.
+    # The NEST network itself lives inside the NEST kernel and cannot be persisted this way.
+    key = hashlib.blake2b()
+    for name in sorted(connectivity_kwargs):
+        value = np.ascontiguousarray(connectivity_kwargs[name])
+        # Arrays of equal bytes but different shape or dtype must not collide:
+        key.update(("%s%s%s" % (name, str(value.shape), value.dtype.str)).encode())
+        key.update(value.tobytes())
+    cache_path = os.path.join(cache_dir, "connectivity_%s.pkl" % key.hexdigest())
+    if os.path.isfile(cache_path):
+        with open(cache_path, "rb") as file:
+            return pickle.load(file)
+    connectivity = Connectivity(**connectivity_kwargs)
+    with open(cache_path, "wb") as file:
+        pickle.dump(connectivity, file)
+    return connectivity
+
+
 def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder,
                  nest_nodes_ids, nest_populations_order=100,
                  tvb_to_nest_mode="rate", nest_to_tvb=True, exclusive_nodes=True,
@@ -51,11 +105,10 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder,
     # Using all default parameters for this example
     nest_model_builder = nest_model_builder(simulator, nest_nodes_ids, config=config)
     nest_model_builder.population_order = nest_populations_order
-    populations = []
-    populations_sizes = []
-    for pop in nest_model_builder.populations:
-        populations.append(pop["label"])
-        populations_sizes.append(int(np.round(pop["scale"] * nest_model_builder.population_order)))
+    populations = [pop["label"] for pop in nest_model_builder.populations]
+    populations_scales = np.fromiter((pop["scale"] for pop in nest_model_builder.populations),
+                                     dtype=np.float64, count=len(nest_model_builder.populations))
+    populations_sizes = np.rint(populations_scales * nest_model_builder.population_order).astype("i").tolist()
     # Common order of neurons' number per population:
     nest_network = nest_model_builder.build_spiking_network()
     print(nest_network.print_str(connectivity=False))
@@ -82,8 +135,9 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder,
     t_start = time.time()
     results = simulator.run(simulation_length=simulation_length)
     # Integrate NEST one more NEST time step so that multimeters get the last time point
-    # unless you plan to continue simulation later
-    simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
+    # unless you plan to continue simulation later (there is nothing to gain without multimeters)
+    if any(len(nest_network.get_devices_by_model(model)) for model in ("multimeter", "spike_multimeter")):
+        simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
     # Clean-up NEST simulation
     simulator.tvb_spikeNet_interface.nest_instance.Cleanup()
     print("\nSimulated in %f secs!" % (time.time() - t_start))
@@ -105,19 +159,29 @@ if __name__ == "__main__":
 
     nest_nodes_ids = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
 
-    import os
     home_path = os.path.join(os.getcwd().split("tvb-multiscale")[0], "tvb-multiscale")
     DATA_PATH = os.path.join(home_path, "examples/data")
-
-    w = np.loadtxt(os.path.join(DATA_PATH, "./basal_ganglia_conn/conn_denis_weights.txt"))
-
-    c = np.loadtxt(os.path.join(DATA_PATH, "./basal_ganglia_conn/aal_plus_BG_centers.txt"), usecols=range(1, 3))
-    rl = np.loadtxt(os.path.join(DATA_PATH, "./basal_ganglia_conn/aal_plus_BG_centers.txt"), dtype="str", usecols=(0,))
-    t = np.loadtxt(os.path.join(DATA_PATH, "./basal_ganglia_conn/BGplusAAL_tract_lengths.txt"))
+    # The parsed data and the connectivity are cached in a temporary directory, not next to the package data:
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "tvb_multiscale", "basal_ganglia_conn")
+    safe_makedirs(CACHE_DIR)
+
+    # The three files are independent, so (the first time, before they are cached) parse them concurrently:
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        w = executor.submit(_load_conn, os.path.join(DATA_PATH, "./basal_ganglia_conn/conn_denis_weights.txt"),
+                            CACHE_DIR)
+        c_rl = executor.submit(_load_centres, os.path.join(DATA_PATH, "./basal_ganglia_conn/aal_plus_BG_centers.txt"),
+                               CACHE_DIR)
+        t = executor.submit(_load_conn, os.path.join(DATA_PATH, "./basal_ganglia_conn/BGplusAAL_tract_lengths.txt"),
+                            CACHE_DIR)
+        w, (c, rl), t = w.result(), c_rl.result(), t.result()
 
     # Remove BG -> Cortex connections
-    w[[0, 1, 2, 3, 6, 7], :][:, 10:] = 0.0
-    connectivity = Connectivity(region_labels=rl, weights=w, centres=c, tract_lengths=t)
+    # (a single combined basic + advanced index writes in place,
+    # unlike the chained w[rows, :][:, 10:], which assigns to a copy)
+    bg_nodes = np.array([0, 1, 2, 3, 6, 7])
+    w[bg_nodes, 10:] = 0.0
+    assert not w[bg_nodes, 10:].any()
+    connectivity = _cached_connectivity(CACHE_DIR, region_labels=rl, weights=w, centres=c, tract_lengths=t)
 
     tvb_model = ReducedWongWangExcIO  # ReducedWongWangExcIOInhI
 
@@ -60,11 +60,10 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder, nest_nodes
     if tvb_nest_builder is not None:
         nest_model_builder.STIMULUS = False
 
-    populations = []
-    populations_sizes = []
-    for pop in nest_model_builder.populations:
-        populations.append(pop["label"])
-        populations_sizes.append(int(np.round(pop["scale"] * nest_model_builder.population_order)))
+    populations = [pop["label"] for pop in nest_model_builder.populations]
+    populations_scales = np.fromiter((pop["scale"] for pop in nest_model_builder.populations),
+                                     dtype=np.float64, count=len(nest_model_builder.populations))
+    populations_sizes = np.rint(populations_scales * nest_model_builder.population_order).astype("i").tolist()
     # Common order of neurons' number per population:
     nest_network = nest_model_builder.build_spiking_network()
 
@@ -106,8 +105,9 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder, nest_nodes
                        np.concatenate([results1[0][1], results2[0][1], results3[0][1]])]]  # concat data
         del results1, results2, results3
         # Integrate NEST one more NEST time step so that multimeters get the last time point
-        # unless you plan to continue simulation later
-        simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
+        # unless you plan to continue simulation later (there is nothing to gain without multimeters)
+        if any(len(nest_network.get_devices_by_model(model)) for model in ("multimeter", "spike_multimeter")):
+            simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
         # Clean-up NEST simulation
         simulator.tvb_spikeNet_interface.nest_instance.Cleanup()
     else:
@@ -392,8 +392,9 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder, nest_nodes
         # ...and simulate!
         tvb_results = simulator.run(simulation_length=TOT_DURATION)
         # Integrate NEST one more NEST time step so that multimeters get the last time point
-        # unless you plan to continue simulation later
-        simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
+        # unless you plan to continue simulation later (there is nothing to gain without multimeters)
+        if any(len(nest_network.get_devices_by_model(model)) for model in ("multimeter", "spike_multimeter")):
+            simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
         # Clean-up NEST simulation
         simulator.tvb_spikeNet_interface.nest_instance.Cleanup()
     else:
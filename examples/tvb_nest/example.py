@@ -23,16 +23,15 @@ from tvb.simulator.models.wilson_cowan_constraint import WilsonCowan
 def results_path_fun(nest_model_builder, tvb_nest_builder, tvb_to_nest_mode="rate", nest_to_tvb=True, config=None):
     if config is None:
         if tvb_nest_builder is not None:
-            tvb_nest_builder_str = "_" + tvb_nest_builder.__name__.split("Builder")[0] + \
-                                   np.where(isinstance(tvb_to_nest_mode, string_types),
-                                             "_" + str(tvb_to_nest_mode), "").item()
+            tvb_nest_builder_str = "_" + tvb_nest_builder.__name__.split("Builder")[0]
+            if isinstance(tvb_to_nest_mode, string_types):
+                tvb_nest_builder_str += "_" + str(tvb_to_nest_mode)
         else:
             tvb_nest_builder_str = ""
         return os.path.join(CONFIGURED.out.FOLDER_RES.split("/res")[0],
                             nest_model_builder.__name__.split("Builder")[0] +
                             tvb_nest_builder_str +
-                            np.where(nest_to_tvb, "_bidir", "").item()
-                            )
+                            ("_bidir" if nest_to_tvb else ""))
     else:
         return config.out.FOLDER_RES
 
@@ -69,11 +68,10 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder,
     # Using all default parameters for this example
     nest_model_builder = nest_model_builder(simulator, nest_nodes_ids, config=config)
     nest_model_builder.population_order = nest_populations_order
-    populations = []
-    populations_sizes = []
-    for pop in nest_model_builder.populations:
-        populations.append(pop["label"])
-        populations_sizes.append(int(np.round(pop["scale"] * nest_model_builder.population_order)))
+    populations = [pop["label"] for pop in nest_model_builder.populations]
+    populations_scales = np.fromiter((pop["scale"] for pop in nest_model_builder.populations),
+                                     dtype=np.float64, count=len(nest_model_builder.populations))
+    populations_sizes = np.rint(populations_scales * nest_model_builder.population_order).astype("i").tolist()
     # Common order of neurons' number per population:
     nest_network = nest_model_builder.build_spiking_network()
 
@@ -102,8 +100,9 @@ def main_example(tvb_sim_model, nest_model_builder, tvb_nest_builder,
     t_start = time.time()
     results = simulator.run(simulation_length=simulation_length)
     # Integrate NEST one more NEST time step so that multimeters get the last time point
-    # unless you plan to continue simulation later
-    simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
+    # unless you plan to continue simulation later (there is nothing to gain without multimeters)
+    if any(len(nest_network.get_devices_by_model(model)) for model in ("multimeter", "spike_multimeter")):
+        simulator.run_spiking_simulator(simulator.tvb_spikeNet_interface.nest_instance.GetKernelStatus("resolution"))
     # Clean-up NEST simulation
     simulator.tvb_spikeNet_interface.nest_instance.Cleanup()
     print("\nSimulated in %f secs!\n" % (time.time() - t_start))
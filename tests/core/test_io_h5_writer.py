@@ -0,0 +1,71 @@
+# coding=utf-8
+import os
+import tempfile
+
+import h5py
+import numpy
+
+from tvb_multiscale.core.io.h5_writer import H5Writer
+
+
+def _temp_h5_path(name):
+    return os.path.join(tempfile.mkdtemp(), name)
+
+
+def test_h5_session():
+    writer = H5Writer()
+    writer.write_mode = "w"
+    path = _temp_h5_path("session.h5")
+    with writer.h5_session(path) as h5_file:
+        for i_write in range(2):
+            # Every write within the session reuses the open file...
+            file, file_path = writer._open_file("Dataset %d" % i_write)
+            assert file is h5_file
+            assert file_path == path
+            writer._write_dicts_at_location({"data%d" % i_write: numpy.arange(3) + i_write}, {}, file)
+            # ...which is only flushed, not closed:
+            writer._close_file(file)
+            assert h5_file.id.valid
+    # ...until the session ends:
+    assert not h5_file.id.valid
+    assert writer._session_file is None
+    with h5py.File(path, "r") as h5_file:
+        assert numpy.all(h5_file["data0"][()] == numpy.arange(3))
+        assert numpy.all(h5_file["data1"][()] == numpy.arange(3) + 1)
+
+
+def test_create_dataset_compression():
+    data = numpy.random.rand(100, 200)
+    path = _temp_h5_path("compression.h5")
+    writer = H5Writer()
+    with h5py.File(path, "w") as h5_file:
+        # No compression by default:
+        assert writer._create_dataset(h5_file, "default", data).compression is None
+        writer.compression = "gzip"
+        assert writer._create_dataset(h5_file, "gzip", data).compression == "gzip"
+        # Small datasets are never compressed:
+        assert writer._create_dataset(h5_file, "small", data[:2, :2]).compression is None
+    with h5py.File(path, "r") as h5_file:
+        for key in ["default", "gzip"]:
+            assert numpy.all(h5_file[key][()] == data)
+        assert numpy.all(h5_file["small"][()] == data[:2, :2])
+
+
+def test_write_direct_chunks():
+    writer = H5Writer()
+    writer.compression = "gzip"
+    writer.compression_workers = 3
+    path = _temp_h5_path("direct_chunks.h5")
+    # The shapes are not multiples of the chunks' shape, so that edge chunks are written too:
+    data = {"float": numpy.random.rand(301, 97),
+            "int": numpy.arange(3 * 101 * 53).reshape((3, 101, 53))}
+    with h5py.File(path, "w") as h5_file:
+        for key, value in data.items():
+            dataset = writer._create_dataset(h5_file, key, value)
+            assert dataset.compression == "gzip"
+            assert dataset.chunks is not None
+    # Chunks written bypassing the filter pipeline have to be read back by HDF5 identically:
+    with h5py.File(path, "r") as h5_file:
+        for key, value in data.items():
+            assert h5_file[key].dtype == value.dtype
+            assert numpy.all(h5_file[key][()] == value)
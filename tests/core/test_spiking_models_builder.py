@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+from tvb.datatypes.connectivity import Connectivity
+
+from tvb_multiscale.core.spiking_models.builders.base import SpikingModelBuilder
+
+
+def _prepare_tvb_simulator(number_of_regions=3, dt=0.1):
+    connectivity = Connectivity(weights=np.ones((number_of_regions, number_of_regions)) - np.eye(number_of_regions),
+                                tract_lengths=np.ones((number_of_regions, number_of_regions)),
+                                region_labels=np.array(["r%d" % i for i in range(number_of_regions)]),
+                                centres=np.zeros((number_of_regions, 3)),
+                                speed=np.array([5.0]))
+    connectivity.configure()
+    return SimpleNamespace(connectivity=connectivity, integrator=SimpleNamespace(dt=dt),
+                           monitors=[SimpleNamespace(period=dt)])
+
+
+class _NamedPopulation(object):
+
+    def __init__(self, label, size):
+        self.label = label
+        self.size = size
+
+
+class _ConnectionsRecordingBuilder(SpikingModelBuilder):
+
+    """A SpikingModelBuilder that only records the connections it is asked to create."""
+
+    def __init__(self, tvb_simulator, spiking_nodes_ids):
+        super(_ConnectionsRecordingBuilder, self).__init__(tvb_simulator, spiking_nodes_ids)
+        self.connections = []
+
+    def build_spiking_population(self, label, model, size, params):
+        return _NamedPopulation(label, size)
+
+    def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
+        return dict()
+
+    def set_synapse(self, syn_model, weight, delay, receptor_type, params={}):
+        return {"synapse_model": syn_model, "weight": weight, "delay": delay, "receptor_type": receptor_type}
+
+    def connect_two_populations(self, source, src_inds_fun, target, trg_inds_fun, conn_params, synapse_params):
+        self.connections.append((source.label, target.label, synapse_params["weight"]))
+
+    def build_and_connect_devices(self, devices):
+        return []
+
+    def build(self):
+        return self._spiking_brain
+
+
+def _prepare_builder(populations_connections=[], nodes_connections=[]):
+    builder = _ConnectionsRecordingBuilder(_prepare_tvb_simulator(), [0, 1])
+    builder.populations = [{"label": "E", "model": "E_model", "scale": 1.0, "params": {}, "nodes": None},
+                           {"label": "I", "model": "I_model", "scale": 0.5, "params": {}, "nodes": None}]
+    default_connection = {"synapse_model": None, "weight": 1.0, "delay": 0.1, "receptor_type": 0,
+                          "params": {}, "conn_spec": {}}
+    builder.default_populations_connection = dict(default_connection, nodes=None)
+    builder.default_nodes_connection = dict(default_connection, source_nodes=None, target_nodes=None)
+    builder.populations_connections = populations_connections
+    builder.nodes_connections = nodes_connections
+    return builder
+
+
+def test_population_property_per_node_cache():
+    builder = _prepare_builder()
+    builder.configure()
+    scales = builder.populations_scales
+    # The property is cached within a configuration:
+    assert builder.populations_scales is scales
+    # In place modifications of the user inputs are taken into account by the next configuration...
+    builder.populations[1]["scale"] = 0.25
+    builder.configure()
+    assert builder.populations_scales is not scales
+    assert builder.populations_scales["I"] == 0.25
+    # ...whereas reassigning the user inputs invalidates the cached property immediately:
+    builder.populations = builder.populations[:1]
+    assert list(builder.populations_scales.keys()) == ["E"]
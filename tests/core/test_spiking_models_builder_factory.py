@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+from tvb_multiscale.core.spiking_models.devices import Device
+from tvb_multiscale.core.spiking_models.builders.factory import \
+    _creates_multiple_devices, build_and_connect_devices_one_to_one
+
+
+class _ConnectedDevice(Device):
+
+    """A minimal Device, which only records the neurons it is connected to."""
+
+    def __init__(self, device, *args, **kwargs):
+        self._neurons = []
+        super(_ConnectedDevice, self).__init__(device, *args, **kwargs)
+
+    def GetConnections(self):
+        return self._neurons
+
+    @property
+    def neurons(self):
+        return self._neurons
+
+
+class _RegionNode(dict):
+
+    def __init__(self, label, populations):
+        super(_RegionNode, self).__init__(populations)
+        self.label = label
+
+
+def _connect_device(device, population, inds_fun, weight, delay, receptor_type, config=None, **kwargs):
+    device._neurons += population
+    return device
+
+
+def _prepare_spiking_nodes():
+    return [_RegionNode("r%d" % i_node, {"E": [10 * i_node + 1, 10 * i_node + 2], "I": [10 * i_node + 3]})
+            for i_node in range(3)]
+
+
+def test_creates_multiple_devices():
+
+    def create_device(device_model, params=None, config=None, number_of_devices=1):
+        pass
+
+    def create_one_device(device_model, params=None, config=None):
+        pass
+
+    assert _creates_multiple_devices(create_device)
+    assert not _creates_multiple_devices(create_one_device)
+    # Callables without an inspectable signature are assumed to create one device at a time:
+    assert not _creates_multiple_devices(len)
+
+
+def test_build_and_connect_devices_one_to_one():
+    calls = []
+
+    def create_devices(device_model, params=None, config=None, number_of_devices=1):
+        calls.append(number_of_devices)
+        return [_ConnectedDevice(None, model=device_model) for _ in range(number_of_devices)]
+
+    def create_device(device_model, params=None, config=None):
+        calls.append(1)
+        return _ConnectedDevice(None, model=device_model)
+
+    device_dict = {"model": "spike_recorder", "params": {}, "connections": {"E": "E", "I": "I"}}
+    spiking_nodes = _prepare_spiking_nodes()
+    # The devices of all region nodes are created with a single call per population variable,
+    # if the spiking simulator allows it...
+    batched_devices = build_and_connect_devices_one_to_one(device_dict, create_devices, _connect_device,
+                                                           spiking_nodes)
+    assert calls == [3, 3]
+    # ...or, otherwise, one at a time, with the same result:
+    devices = build_and_connect_devices_one_to_one(device_dict, create_device, _connect_device, spiking_nodes)
+    assert calls == [3, 3] + [1] * 6
+    for pop_var in ["E", "I"]:
+        for node in spiking_nodes:
+            assert batched_devices[pop_var][node.label].neurons == devices[pop_var][node.label].neurons
+            assert devices[pop_var][node.label].neurons == node[pop_var]
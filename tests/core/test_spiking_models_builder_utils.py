@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+import xarray as xr
+from pandas import Index
+
+from tvb_multiscale.core.utils.data_structures_utils import property_to_fun, concat_DataArrays
+from tvb_multiscale.core.spiking_models.builders.base import memoize_property_fun, property_value, scales_to_sizes
+
+
+def test_memoize_property_fun():
+    calls = []
+
+    def weight(source_node, target_node):
+        calls.append((source_node, target_node))
+        return 0.1 * source_node + target_node
+
+    memoized_weight = memoize_property_fun(weight)
+    for _ in range(3):
+        assert memoized_weight(1, 2) == weight(1, 2)
+        assert memoized_weight(2, 1) == weight(2, 1)
+    # 2 calls of the memoized function + 6 direct calls:
+    assert len(calls) == 8
+
+    # Unhashable arguments are evaluated without caching:
+    memoized_len = memoize_property_fun(len)
+    assert memoized_len([1, 2, 3]) == 3
+
+
+def test_scales_to_sizes():
+    assert scales_to_sizes([1.0, 0.25, 0.004], 100) == [100, 25, 0]
+    assert scales_to_sizes([], 100) == []
+
+
+def test_property_value():
+    constant = property_to_fun({"distribution": "uniform", "low": 1.0, "high": 2.0})
+    assert constant._constant is constant(0, 1)
+    assert memoize_property_fun(constant) is constant
+    assert property_value(constant, 0, 1) is constant._constant
+    delay = property_to_fun(lambda source_node, target_node: source_node + target_node)
+    assert not hasattr(delay, "_constant")
+    assert property_value(delay, 1, 2) == 3
+
+
+def test_concat_DataArrays():
+    index = Index(["E", "I"], name="Population")
+    coords = {"Region": ["r0", "r1"], "Time": [0.1, 0.2, 0.3]}
+    data_arrays = [xr.DataArray(np.random.rand(2, 3), dims=["Region", "Time"], coords=coords, name=name)
+                   for name in index]
+    # Aligned DataArrays are stacked:
+    assert concat_DataArrays(data_arrays, index).identical(xr.concat(data_arrays, dim=index))
+    # Not aligned DataArrays are concatenated by xarray:
+    data_arrays[1] = data_arrays[1].assign_coords(Region=["r2", "r3"])
+    assert concat_DataArrays(data_arrays, index).identical(xr.concat(data_arrays, dim=index))
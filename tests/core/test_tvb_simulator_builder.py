@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+from tvb.datatypes.connectivity import Connectivity
+
+from tvb_multiscale.core.tvb.simulator_builder import _percentile, SimulatorBuilder
+
+
+def _prepare_connectivity(number_of_regions=5):
+    rng = np.random.RandomState(0)
+    connectivity = Connectivity(weights=rng.uniform(0.0, 10.0, (number_of_regions, number_of_regions)),
+                                tract_lengths=rng.uniform(1.0, 100.0, (number_of_regions, number_of_regions)),
+                                region_labels=np.array(["r%d" % i for i in range(number_of_regions)]),
+                                centres=np.zeros((number_of_regions, 3)),
+                                speed=np.array([5.0]))
+    connectivity.configure()
+    return connectivity
+
+
+def test_percentile():
+    values = np.random.RandomState(0).uniform(0.0, 10.0, (7, 11))
+    for q in [0, 5, 50, 95, 99.9, 100]:
+        assert np.allclose(_percentile(values, q), np.percentile(values, q))
+    assert _percentile(np.array([3.0]), 95) == 3.0
+
+
+def test_build_connectivity():
+    connectivity = _prepare_connectivity()
+    weights = connectivity.weights.copy()
+    tract_lengths = connectivity.tract_lengths.copy()
+    simulator_builder = SimulatorBuilder()
+    simulator_builder.connectivity = connectivity
+    simulator_builder.scale_connectivity_weights = None
+    simulator_builder.symmetric_connectome = True
+    simulator_builder.scale_connectivity_weights_by_percentile = 95
+    simulator_builder.ceil_connectivity = 1.0
+    connectivity = simulator_builder.build_connectivity()
+    # The connectome is symmetrized to the geometric mean of its reciprocal connections...
+    assert np.allclose(connectivity.tract_lengths, np.sqrt(tract_lengths * tract_lengths.T))
+    weights = np.sqrt(weights * weights.T)
+    # ...then the weights are scaled by their 95th percentile...
+    weights /= np.percentile(weights, 95)
+    # ...and, finally, they are ceiled:
+    assert np.allclose(connectivity.weights, np.minimum(weights, 1.0))
+    assert connectivity.weights.max() == 1.0
+    assert np.allclose(connectivity.weights, connectivity.weights.T)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+from tvb.datatypes.connectivity import Connectivity
+
+from tvb_multiscale.tvb_nest.config import CONFIGURED
+from tvb_multiscale.tvb_nest.nest_models.builders.base import NESTModelBuilder
+from tvb_multiscale.tvb_nest.nest_models.builders.nest_factory import create_conn_spec
+
+
+class _NodeCollection(object):
+
+    """A minimal stand-in of a NEST NodeCollection of consecutive or concatenated neurons' ids."""
+
+    def __init__(self, ids):
+        self.ids = list(ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, inds):
+        return _NodeCollection(self.ids[inds])
+
+    def __add__(self, other):
+        return _NodeCollection(self.ids + other.ids)
+
+    def __eq__(self, other):
+        return isinstance(other, _NodeCollection) and self.ids == other.ids
+
+
+class _CollocatedSynapses(object):
+
+    def __init__(self, *syn_specs):
+        self.syn_specs = syn_specs
+
+
+class _NESTKernel(object):
+
+    """A minimal NEST kernel, which only records the neurons created and the connections made."""
+
+    NodeCollection = _NodeCollection
+    CollocatedSynapses = _CollocatedSynapses
+
+    def __init__(self):
+        self.number_of_neurons = 0
+        self.creations = []
+        self.connections = []
+
+    def Create(self, model, n=1, params=None):
+        self.creations.append((model, n, params))
+        neurons = _NodeCollection(range(self.number_of_neurons + 1, self.number_of_neurons + n + 1))
+        self.number_of_neurons += n
+        return neurons
+
+    def Connect(self, pre, post, conn_spec=None, syn_spec=None):
+        self.connections.append((pre, post, conn_spec, syn_spec))
+
+    def GetKernelStatus(self, key):
+        return {"min_delay": 0.1, "resolution": 0.1}[key]
+
+
+def _prepare_tvb_simulator(number_of_regions=3, dt=0.1):
+    connectivity = Connectivity(weights=np.ones((number_of_regions, number_of_regions)) - np.eye(number_of_regions),
+                                tract_lengths=np.ones((number_of_regions, number_of_regions)),
+                                region_labels=np.array(["r%d" % i for i in range(number_of_regions)]),
+                                centres=np.zeros((number_of_regions, 3)),
+                                speed=np.array([5.0]))
+    connectivity.configure()
+    return SimpleNamespace(connectivity=connectivity, integrator=SimpleNamespace(dt=dt),
+                           monitors=[SimpleNamespace(period=dt)])
+
+
+def _prepare_builder(populations):
+    builder = NESTModelBuilder(_prepare_tvb_simulator(), [0, 1], nest_instance=_NESTKernel(), config=CONFIGURED)
+    builder.population_order = 10
+    builder.populations = populations
+    builder._configure_populations()
+    return builder
+
+
+def _assert_populations(builder, expected_neurons):
+    # Every population is a complete NESTPopulation with the expected label, size and neurons:
+    for node_label, node_neurons in expected_neurons.items():
+        for label, neurons in node_neurons.items():
+            population = builder._spiking_brain[node_label][label]
+            assert population.label == label
+            assert population.number_of_neurons == len(neurons)
+            assert population.population.ids == list(neurons)
+
+
+def test_build_spiking_populations_of_same_model_and_params():
+    builder = _prepare_builder([{"label": "E", "model": "iaf_cond_alpha", "scale": 1.0, "params": {"V_th": -50.0}},
+                                {"label": "I", "model": "iaf_cond_alpha", "scale": 0.5, "params": {"V_th": -50.0}}])
+    builder.build_spiking_region_nodes()
+    # All populations are created with a single Create call...
+    assert builder.nest_instance.creations == [("iaf_cond_alpha", 30, {"V_th": -50.0})]
+    # ...and get the same neurons as if they were created one at a time, in build order:
+    _assert_populations(builder, {"r0": {"E": range(1, 11), "I": range(11, 16)},
+                                  "r1": {"E": range(16, 26), "I": range(26, 31)}})
+
+
+def test_build_spiking_populations_one_by_one():
+    builder = _prepare_builder([{"label": "E", "model": "iaf_cond_alpha", "scale": 1.0,
+                                 "params": {"V_th": -50.0}},
+                                # Different models are not created together:
+                                {"label": "I", "model": "iaf_cond_beta", "scale": 0.5,
+                                 "params": {"V_th": -50.0}},
+                                # Neither are populations with non scalar parameters:
+                                {"label": "X", "model": "iaf_cond_beta", "scale": 0.2,
+                                 "params": {"V_th": np.array([-50.0, -55.0])}}])
+    builder.build_spiking_region_nodes()
+    assert [creation[:2] for creation in builder.nest_instance.creations] == \
+           [("iaf_cond_alpha", 10), ("iaf_cond_beta", 5), ("iaf_cond_beta", 2)] * 2
+    _assert_populations(builder, {"r0": {"E": range(1, 11), "I": range(11, 16), "X": range(16, 18)},
+                                  "r1": {"E": range(18, 28), "I": range(28, 33), "X": range(33, 35)}})
+
+
+def _prepare_connected_builder():
+    builder = _prepare_builder([{"label": "E", "model": "iaf_cond_alpha", "scale": 1.0, "params": {}},
+                                {"label": "I", "model": "iaf_cond_alpha", "scale": 0.5, "params": {}}])
+    builder.build_spiking_region_nodes()
+    sources = [builder._spiking_brain[node_label]["E"] for node_label in ["r0", "r1"]]
+    targets = [builder._spiking_brain[node_label]["I"] for node_label in ["r0", "r1"]]
+    return builder, sources, targets
+
+
+def test_connect_populations_all_to_all():
+    builder, sources, targets = _prepare_connected_builder()
+    syn_spec = builder.set_synapse("static_synapse", 1.0, 0.1, 0)
+    builder.connect_populations(sources, None, targets, None, {"rule": "all_to_all"}, syn_spec)
+    # All pairs of populations are connected with a single Connect among the union of their neurons:
+    assert len(builder.nest_instance.connections) == 1
+    pre, post, conn_spec, connected_syn_spec = builder.nest_instance.connections[0]
+    assert pre.ids == list(range(1, 11)) + list(range(16, 26))
+    assert post.ids == list(range(11, 16)) + list(range(26, 31))
+    assert conn_spec["rule"] == "all_to_all"
+    assert connected_syn_spec == {"synapse_model": "static_synapse", "weight": 1.0, "delay": 0.1,
+                                  "receptor_type": 0}
+    # The input syn_spec, which is shared by all pairs of populations, is not modified:
+    assert syn_spec == {"synapse_model": "static_synapse", "weight": 1.0, "delay": 0.1, "receptor_type": 0}
+
+
+def test_connect_populations_pairwise():
+    builder, sources, targets = _prepare_connected_builder()
+    syn_spec = builder.set_synapse("static_synapse", 1.0, 0.1, 0)
+    # Neurons' selections that are not NodeCollections cannot be concatenated...
+    builder.connect_populations(sources, lambda neurons: list(neurons.ids), targets, None,
+                                {"rule": "all_to_all"}, syn_spec)
+    # ...and neither are the populations of probabilistic connectivity rules:
+    builder.connect_populations(sources, None, targets, None, {"rule": "fixed_indegree", "p": 0.2}, syn_spec)
+    # ...in which case every pair of populations is connected separately:
+    connections = builder.nest_instance.connections
+    assert len(connections) == 8
+    assert [connection[0] for connection in connections[:4]] == \
+           [list(range(1, 11))] * 2 + [list(range(16, 26))] * 2
+    assert [connection[1].ids for connection in connections[4:]] == \
+           [list(range(11, 16)), list(range(26, 31))] * 2
+    assert all(connection[2]["indegree"] == 2 for connection in connections[4:])
+
+
+def test_connect_neurons_to_several_receptors():
+    builder, sources, targets = _prepare_connected_builder()
+    src_neurons = sources[0].population
+    trg_neurons = targets[0].population
+    syn_spec = builder.set_synapse("static_synapse", 1.0, 0.1, [1, 2])
+    # Deterministic connectivity rules connect all receptors with a single Connect of CollocatedSynapses...
+    builder._connect_neurons(src_neurons, trg_neurons, {"rule": "all_to_all"}, syn_spec)
+    assert len(builder.nest_instance.connections) == 1
+    collocated_synapses = builder.nest_instance.connections[0][3]
+    assert isinstance(collocated_synapses, _CollocatedSynapses)
+    assert [spec["receptor_type"] for spec in collocated_synapses.syn_specs] == [1, 2]
+    # ...whereas probabilistic ones connect every receptor separately:
+    builder._connect_neurons(src_neurons, trg_neurons, {"rule": "fixed_indegree", "indegree": 2}, syn_spec)
+    assert len(builder.nest_instance.connections) == 3
+    assert [connection[3]["receptor_type"] for connection in builder.nest_instance.connections[1:]] == [1, 2]
+
+
+def test_create_conn_spec():
+    assert create_conn_spec(n_src=10, n_trg=20, config=CONFIGURED, rule="fixed_indegree", p=0.5) == \
+           ({"rule": "fixed_indegree", "allow_autapses": True, "allow_multapses": True, "indegree": 5}, 100)
+    assert create_conn_spec(n_src=10, n_trg=20, config=CONFIGURED, rule="fixed_outdegree", outdegree=4) == \
+           ({"rule": "fixed_outdegree", "allow_autapses": True, "allow_multapses": True, "outdegree": 4}, 40)
+    assert create_conn_spec(n_src=10, n_trg=20, config=CONFIGURED, rule="fixed_total_number", p=0.5)[1] == 100
+    assert create_conn_spec(n_src=10, n_trg=20, config=CONFIGURED, rule="one_to_one")[1] == 10
+    # The default rule is all_to_all:
+    assert create_conn_spec(n_src=10, n_trg=20, config=CONFIGURED) == \
+           ({"rule": "all_to_all", "allow_autapses": True, "allow_multapses": True}, 200)
+    # Autapses are excluded from the number of connections within the same population, if not allowed:
+    assert create_conn_spec(n_src=10, n_trg=10, src_is_trg=True, config=CONFIGURED,
+                            rule="pairwise_bernoulli", p=0.2, allow_autapses=False) == \
+           ({"rule": "pairwise_bernoulli", "allow_autapses": False, "allow_multapses": True, "p": 0.2}, 18)
@@ -114,10 +114,16 @@ class TVBSpikeNetInterfaceBuilder(object):
         # We return from a Spiking Network multimeter or voltmeter the membrane potential in mV
         self.w_potential_to_tvb = 1.0
 
+        # Mutable defaults are set per instance, so that they are not shared via the class,
+        # since the builders of the models append their default interfaces to them:
         if spiking_to_tvb_interfaces is not None:
             self.spikeNet_to_tvb_interfaces = ensure_list(spiking_to_tvb_interfaces)
+        else:
+            self.spikeNet_to_tvb_interfaces = []
         if tvb_to_spiking_interfaces is not None:
             self.tvb_to_spikeNet_interfaces = ensure_list(tvb_to_spiking_interfaces)
+        else:
+            self.tvb_to_spikeNet_interfaces = []
 
     @property
     def config(self):
@@ -6,8 +6,8 @@ import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
 from tvb_multiscale.core.interfaces.spikeNet_to_tvb_interface import SpikeNetToTVBinterface
+from tvb_multiscale.core.utils.data_structures_utils import property_to_fun
 
-from tvb.contrib.scripts.utils.data_structures_utils import property_to_fun
 
 
 LOG = initialize_logger(__name__)
@@ -61,7 +61,9 @@ class SpikeNetToTVBInterfaceBuilder(object):
         if neurons_inds_fun is not None:
             neurons_inds_fun = property_to_fun(neurons_inds_fun)
         shape = (len(spiking_nodes),)
-        interface_weights = np.ones(shape).astype("O")
+        # The interface weights scale the transmitted data at every time step,
+        # so they are kept as a float array, unlike the delays, which might be dictionaries for distributions:
+        interface_weights = np.ones(shape)
         delays = np.zeros(shape).astype("O")
         neurons_inds = np.tile([None], shape).astype("O")
         for i_node, spiking_node in enumerate(spiking_nodes):
@@ -72,8 +74,8 @@ class SpikeNetToTVBInterfaceBuilder(object):
         interface["delays"] = delays
         interface["neurons_inds"] = neurons_inds
         # Convert TVB node index to interface SpikeNet node index:
-        interface["nodes"] = [np.where(self.spiking_nodes_ids == spiking_node)[0][0]
-                              for spiking_node in spiking_nodes]
+        spiking_nodes_inds = dict((node, i_node) for i_node, node in enumerate(self.spiking_nodes_ids))
+        interface["nodes"] = [spiking_nodes_inds[spiking_node] for spiking_node in spiking_nodes]
         devices = self.build_and_connect_devices([interface], self.spiking_nodes)
         for name, device_set in devices.items():
             try:
@@ -5,9 +5,9 @@ from pandas import Series
 import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
+from tvb_multiscale.core.utils.data_structures_utils import property_to_fun
 
 from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
-from tvb.contrib.scripts.utils.data_structures_utils import property_to_fun
 
 
 LOG = initialize_logger(__name__)
@@ -78,20 +78,32 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
             neurons_inds_fun = property_to_fun(neurons_inds_fun)
         # TODO: Find a way to change self directed weights in cases of non exclusive TVB and Spiking Network nodes!
         # Defaults just follow TVB connectivity
-        weights = np.array(self.tvb_weights[source_tvb_nodes][:, target_nodes]).astype("O")
-        delays = np.array(self.tvb_delays[source_tvb_nodes][:, target_nodes]).astype("O")
+        # Select the (source, target) block in one indexing step, without chained copies:
+        tvb_block = np.ix_(source_tvb_nodes, target_nodes)
+        weights = np.asarray(self.tvb_weights)[tvb_block].astype("O")
+        delays = np.asarray(self.tvb_delays)[tvb_block].astype("O")
         receptor_type = np.zeros(delays.shape).astype("i")
         neurons_inds = np.tile([None], delays.shape).astype("O")
         device_names = []
+        # Map nodes' indices to their positions once, instead of searching for every node:
+        tvb_nodes_inds = dict((node, i_node) for i_node, node in enumerate(self.tvb_nodes_ids))
+        spiking_nodes_inds = dict((node, i_node) for i_node, node in enumerate(self.spiking_nodes_ids))
+        # Fill constant properties for all (source, target) pairs at once,
+        # and leave only the actual functions of the region nodes to be evaluated per pair:
+        pair_funs = []
+        for values, fun in zip([weights, delays, receptor_type], [weight_fun, delay_fun, receptor_type_fun]):
+            if hasattr(fun, "_constant"):
+                values.fill(fun._constant)
+            else:
+                pair_funs.append((values, fun))
         # Apply now possible functions per source and target region node:
         for src_node in source_tvb_nodes:
-            i_src = np.where(self.tvb_nodes_ids == src_node)[0][0]
+            i_src = tvb_nodes_inds[src_node]
             interface_weights[i_src] = interface_weight_fun(src_node)
             device_names.append(self.node_labels[src_node])
             for i_trg, trg_node in enumerate(target_nodes):
-                weights[i_src, i_trg] = weight_fun(src_node, trg_node)
-                delays[i_src, i_trg] = delay_fun(src_node, trg_node)
-                receptor_type[i_src, i_trg] = receptor_type_fun(src_node, trg_node)
+                for values, fun in pair_funs:
+                    values[i_src, i_trg] = fun(src_node, trg_node)
                 if neurons_inds_fun is not None:
                     neurons_inds[i_src, i_trg] = lambda neurons_inds: neurons_inds_fun(src_node, trg_node, neurons_inds)
         interface["names"] = device_names
@@ -99,7 +111,7 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
         interface["delays"] = delays
         interface["receptor_type"] = receptor_type
         interface["neurons_inds"] = neurons_inds
-        interface["nodes"] = [np.where(self.spiking_nodes_ids == trg_node)[0][0] for trg_node in target_nodes]
+        interface["nodes"] = [spiking_nodes_inds[trg_node] for trg_node in target_nodes]
         # Generate the devices => "proxy TVB nodes":
         devices = self.build_and_connect_devices([interface], self.spiking_nodes)
         tvb_to_spikeNet_interface = Series()
@@ -5,9 +5,9 @@ import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
 from tvb_multiscale.core.interfaces.tvb_to_spikeNet_parameter_interface import TVBtoSpikeNetParameterInterface
+from tvb_multiscale.core.utils.data_structures_utils import property_to_fun
 
 from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
-from tvb.contrib.scripts.utils.data_structures_utils import property_to_fun
 
 
 LOG = initialize_logger(__name__)
@@ -54,7 +54,8 @@ class TVBtoSpikeNetParameterInterfaceBuilder(object):
         if neurons_inds_fun is not None:
             neurons_inds_fun = property_to_fun(neurons_inds_fun)
         shape = (len(spiking_nodes_ids),)
-        interface_weights = np.ones(shape).astype("O")
+        # The interface weights scale the transmitted data at every time step, so they are kept as a float array:
+        interface_weights = np.ones(shape)
         neurons_inds = np.tile([None], shape).astype("O")
         for i_node, spiking_node_id in enumerate(spiking_nodes_ids):
             interface_weights[i_node] = interface_weight_fun(spiking_node_id)
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
 from six import string_types
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import product
 import os
+import zlib
 import h5py
 import inspect
 import numpy
@@ -26,8 +30,37 @@ class H5Writer(object):
     H5_DATE_ATTRIBUTE = "Last_update"
     force_overwrite = True
     write_mode = "a"
+    # If compression is set (e.g., to "gzip", or to the faster but h5py only "lzf"),
+    # numeric datasets of at least compression_min_nbytes are written chunked and compressed:
+    compression = None
+    compression_min_nbytes = 2 ** 16
+    compression_opts = None
+    # For "gzip" compression, if > 1, chunks are deflated in parallel and written bypassing the filter pipeline:
+    compression_workers = 0
+    _session_file = None
+    _session_path = None
+
+    @contextmanager
+    def h5_session(self, path):
+        """Context manager that keeps the H5 file at path open for all write_* calls within it.
+           They then only flush the file, instead of closing it, which happens once at exit.
+           Arguments:
+            - path: H5 file path to be written
+           Yields:
+            - the open h5py.File
+        """
+        h5_file, path = self._open_file("H5 session", path)
+        self._session_file, self._session_path = h5_file, path
+        try:
+            yield h5_file
+        finally:
+            self._session_file, self._session_path = None, None
+            h5_file.close()
 
     def _open_file(self, name, path=None, h5_file=None):
+        if h5_file is None and self._session_file is not None and path in (None, self._session_path):
+            self.logger.info("Writing %s to: %s" % (name, self._session_path))
+            return self._session_file, self._session_path
         if h5_file is None:
             if self.write_mode == "w":
                 path = change_filename_or_overwrite(path, self.force_overwrite)
@@ -37,7 +70,10 @@ class H5Writer(object):
 
     def _close_file(self, h5_file, close_file=True):
         if close_file:
-            h5_file.close()
+            if h5_file is self._session_file:
+                h5_file.flush()
+            else:
+                h5_file.close()
 
     def _log_success(self, name, path=None):
         if path is not None:
@@ -91,11 +127,42 @@ class H5Writer(object):
 
         return datasets_dict, metadata_dict, groups_keys
 
+    def _write_direct_chunks(self, location, key, data):
+        level = 4 if self.compression_opts is None else self.compression_opts
+        dataset = location.create_dataset(key, shape=data.shape, dtype=data.dtype, chunks=True,
+                                          compression="gzip", compression_opts=level)
+        chunks = dataset.chunks
+
+        def deflate_chunk(offset):
+            # HDF5 stores edge chunks at full chunk size, hence the zero padding:
+            chunk = numpy.zeros(chunks, dtype=data.dtype)
+            block = data[tuple(slice(start, start + size) for start, size in zip(offset, chunks))]
+            chunk[tuple(slice(0, size) for size in block.shape)] = block
+            return zlib.compress(chunk.tobytes(), level)
+
+        offsets = list(product(*[range(0, shape, size) for shape, size in zip(data.shape, chunks)]))
+        # zlib releases the GIL while compressing, so chunks can be deflated by several threads:
+        with ThreadPoolExecutor(max_workers=self.compression_workers) as executor:
+            for offset, deflated_chunk in zip(offsets, executor.map(deflate_chunk, offsets)):
+                dataset.id.write_direct_chunk(offset, deflated_chunk)
+        return dataset
+
+    def _create_dataset(self, location, key, data):
+        data = numpy.asarray(data)
+        if self.compression and data.ndim > 0 and data.nbytes >= self.compression_min_nbytes \
+                and numpy.issubdtype(data.dtype, numpy.number):
+            if self.compression == "gzip" and self.compression_workers > 1:
+                return self._write_direct_chunks(location, key, numpy.ascontiguousarray(data))
+            # Let h5py determine the chunk shape, and shuffle bytes for better compression of floats:
+            return location.create_dataset(key, data=data, chunks=True, shuffle=True,
+                                           compression=self.compression, compression_opts=self.compression_opts)
+        return location.create_dataset(key, data=data)
+
     def _write_dicts_at_location(self, datasets_dict, metadata_dict, location):
         for key, value in datasets_dict.items():
             try:
                 try:
-                    location.create_dataset(key, data=value)
+                    self._create_dataset(location, key, value)
                 except:
                     location.create_dataset(key, data=numpy.str(value))
             except:
@@ -193,7 +260,7 @@ class H5Writer(object):
                     new_value = numpy.array(value)
                     if not numpy.issubdtype(value.dtype, numpy.number):
                         new_value = self._convert_sequences_of_strings(new_value)
-                    group.create_dataset(key, data=new_value)
+                    self._create_dataset(group, key, new_value)
                 else:
                     if callable(value):
                         group.attrs.create(key, inspect.getsource(value))
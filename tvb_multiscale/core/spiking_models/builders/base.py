@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+from functools import partial
+from numbers import Number
 from six import string_types
-from collections import OrderedDict
 import numpy as np
-from pandas import Series
+from pandas import Series, concat, unique
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
 from tvb_multiscale.core.spiking_models.region_node import SpikingRegionNode
 from tvb_multiscale.core.spiking_models.brain import SpikingBrain
+from tvb_multiscale.core.utils.data_structures_utils import property_to_fun
 from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
-from tvb.contrib.scripts.utils.data_structures_utils import ensure_list, flatten_tuple, property_to_fun
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list, flatten_tuple
 
 
 LOG = initialize_logger(__name__)
@@ -39,9 +41,15 @@ class SpikingModelBuilder(object):
 
     population_order = 100
 
+    # The synapse models whose connections of zero weight are skipped, since they have no effect.
+    # Empty by default, i.e., no connection is skipped,
+    # because the weights of plastic synapses may evolve from zero during simulation:
+    static_synapse_models = ()
+
     # User inputs:
     tvb_simulator = None
-    spiking_nodes_ids = []
+    _spiking_nodes_ids = np.array([], dtype="i")
+    _id_to_local_index = {}
     populations = []
     populations_connections = []
     nodes_connections = []
@@ -51,7 +59,10 @@ class SpikingModelBuilder(object):
     # Internal configurations and outputs:
     monitor_period = 1.0
     spiking_dt = 0.1 / tvb_to_spiking_dt_ratio
-    _spiking_nodes_labels = []
+    _spiking_nodes_labels = None
+    _region_labels = None
+    _region_labels_list = None
+    _region_label_to_index = None
     _populations = []
     _populations_connections = []
     _nodes_connections = []
@@ -71,8 +82,25 @@ class SpikingModelBuilder(object):
         # If there is only the Raw monitor, then self.monitor_period = self.tvb_dt
         self.monitor_period = tvb_simulator.monitors[-1].period
         self.population_order = 100
+        # Mutable defaults are set per instance, so that they are not shared via the class:
+        self.default_population = {}
+        self.default_populations_connection = {}
+        self.default_nodes_connection = {}
+        self.default_devices_connection = {}
+        self.populations = []
+        self.populations_connections = []
+        self.nodes_connections = []
+        self.output_devices = []
+        self.input_devices = []
+        self._populations = []
+        self._populations_connections = []
+        self._nodes_connections = []
+        self._output_devices = []
+        self._input_devices = []
         self._models = []
         self._spiking_brain = SpikingBrain()
+        self._properties_per_node_cache = {}
+        self._configuration_counter = 0
 
     @abstractmethod
     def build_spiking_population(self, label, model, size, params):
@@ -103,6 +131,17 @@ class SpikingModelBuilder(object):
         """
         pass
 
+    @property
+    def spiking_nodes_ids(self):
+        return self._spiking_nodes_ids
+
+    @spiking_nodes_ids.setter
+    def spiking_nodes_ids(self, spiking_nodes_ids):
+        self._spiking_nodes_ids = np.unique(spiking_nodes_ids)
+        # Map every spiking node's region index to its index among the spiking nodes, for O(1) lookups:
+        self._id_to_local_index = dict(zip(self._spiking_nodes_ids.tolist(), range(len(self._spiking_nodes_ids))))
+        self._spiking_nodes_labels = None
+
     @property
     def min_delay(self):
         return self.default_min_delay
@@ -139,6 +178,28 @@ class SpikingModelBuilder(object):
         """
         pass
 
+    def connect_populations(self, sources, src_inds_fun, targets, trg_inds_fun, conn_params, synapse_params):
+        """Method to connect every combination of source and target SpikingPopulation instances
+           with the same connectivity and synapse parameters.
+           Spiking simulator specific builders might override it to create these connections in fewer calls.
+           Arguments:
+            sources: a sequence of the source SpikingPopulation instances of the connection
+            src_inds_fun: a function that selects a subset of the souce populations' neurons
+            targets: a sequence of the target SpikingPopulation instances of the connection
+            trg_inds_fun: a function that selects a subset of the target populations' neurons
+            conn_params: a dict of parameters of the connectivity pattern among the neurons of the populations,
+                         excluding weight and delay ones
+            synapse_params: a dict of parameters of the synapses among the neurons of the populations,
+                            including weight, delay and synaptic receptor type ones
+        """
+        # For every combination of source...
+        for source in sources:
+            # ...and target populations...
+            for target in targets:
+                # ...connect the two populations:
+                self.connect_two_populations(source, src_inds_fun, target, trg_inds_fun,
+                                             conn_params, synapse_params)
+
     @abstractmethod
     def build_and_connect_devices(self, devices):
         """A method to build and connect to the network all devices in the input configuration dict."""
@@ -175,24 +236,60 @@ class SpikingModelBuilder(object):
 
     @property
     def number_of_spiking_nodes(self):
-        return np.maximum(len(self.spiking_nodes_ids), 1)
+        return max(len(self.spiking_nodes_ids), 1)
 
     # The methods below are used in order to return the builder's properties
     # per spiking node or spiking nodes' connection
 
     @property
     def spiking_nodes_labels(self):
-        if len(self._spiking_nodes_labels) == self.number_of_spiking_nodes:
-            return self._spiking_nodes_labels
-        else:
-            return self.tvb_connectivity.region_labels[self.spiking_nodes_ids]
+        if self._spiking_nodes_labels is None:
+            # Cache the labels, which are reset whenever the spiking_nodes_ids are set,
+            # or the cached properties are invalidated:
+            self._spiking_nodes_labels = self.tvb_connectivity.region_labels[self.spiking_nodes_ids]
+        return self._spiking_nodes_labels
+
+    def _get_region_labels_maps(self):
+        # Cache the region labels as a list, as well as their mapping to the regions' indices, for O(1) lookups:
+        region_labels = self.tvb_connectivity.region_labels
+        if self._region_labels is not region_labels:
+            self._region_labels = region_labels
+            self._region_labels_list = region_labels.tolist()
+            self._region_label_to_index = dict(zip(self._region_labels_list, range(len(self._region_labels_list))))
+        return self._region_labels_list, self._region_label_to_index
+
+    def _invalidate_caches(self):
+        """Method to clear the cached properties per node or nodes' connection,
+           starting a new configuration, which every cached property is bound to.
+           It is called by configure(), so that any in place modifications of the user inputs
+           (e.g., populations, connections) are taken into account by the next configuration,
+           whereas reassigning them invalidates the cached properties automatically."""
+        self._configuration_counter += 1
+        self._properties_per_node_cache = {}
+        self._spiking_nodes_labels = None
+
+    def _get_cached_property_per_node(self, inputs_name, property, inputs):
+        # A cached output is valid only within the configuration,
+        # and for the very same user inputs' list, it was computed for:
+        counter, cached_inputs, output = \
+            self._properties_per_node_cache.get((inputs_name, property), (None, None, None))
+        if counter == self._configuration_counter and cached_inputs is inputs:
+            return output
+        return None
+
+    def _set_cached_property_per_node(self, inputs_name, property, inputs, output):
+        self._properties_per_node_cache[(inputs_name, property)] = (self._configuration_counter, inputs, output)
+        return output
 
     def _population_property_per_node(self, property):
-        output = OrderedDict()
-        for population in self.populations:
-            output[population["label"]] = property_per_node(population[property],
-                                                            population.get("nodes", self.spiking_nodes_ids),
-                                                            self.tvb_connectivity.region_labels)
+        output = self._get_cached_property_per_node("populations", property, self.populations)
+        if output is None:
+            output = {}
+            for population in self.populations:
+                output[population["label"]] = property_per_node(population[property],
+                                                                population.get("nodes", self.spiking_nodes_ids),
+                                                                *self._get_region_labels_maps())
+            self._set_cached_property_per_node("populations", property, self.populations, output)
         return output
 
     @property
@@ -214,13 +311,15 @@ class SpikingModelBuilder(object):
     @property
     def populations_sizes(self):
         """Method to return the number of neurons of each SpikingPopulation of the network."""
-        sizes = self._population_property_per_node("scale")
-        for pop_name, scale in sizes.items():
+        # Build a new output, so that the cached scales are not modified:
+        sizes = {}
+        for pop_name, scale in self._population_property_per_node("scale").items():
             if isinstance(scale, dict):
-                for node_key, node_scale in scale.items():
-                    sizes[pop_name][node_key] = int(np.round(sizes[pop_name][node_key] * self.population_order))
+                # Convert all nodes' scales to sizes at once:
+                sizes[pop_name] = dict(zip(scale.keys(),
+                                           scales_to_sizes(list(scale.values()), self.population_order)))
             else:
-                sizes[pop_name] *= self.population_order
+                sizes[pop_name] = scale * self.population_order
         return sizes
 
     @property
@@ -230,12 +329,15 @@ class SpikingModelBuilder(object):
     def _connection_label(self, connection):
         return "%s->%s" % (str(connection["source"]), str(connection["target"]))
 
-    def _connection_property_per_node(self, property, connections):
-        output = OrderedDict()
-        for conn in connections:
-            output[self._connection_label(conn)] = \
-                property_per_node(conn[property], conn.get("nodes", self.spiking_nodes_ids),
-                                  self.tvb_connectivity.region_labels)
+    def _connection_property_per_node(self, property, connections, connections_name="populations_connections"):
+        output = self._get_cached_property_per_node(connections_name, property, connections)
+        if output is None:
+            output = {}
+            for conn in connections:
+                output[self._connection_label(conn)] = \
+                    property_per_node(conn[property], conn.get("nodes", self.spiking_nodes_ids),
+                                      *self._get_region_labels_maps())
+            self._set_cached_property_per_node(connections_name, property, connections, output)
         return output
 
     def _population_connection_property_per_node(self, property):
@@ -270,13 +372,17 @@ class SpikingModelBuilder(object):
         return self._population_connection_property_per_node("nodes")
 
     def _nodes_connection_property_per_node(self, property):
-        output = OrderedDict()
-        for conn in self.nodes_connections:
-            output[self._connection_label(conn)] = \
-                property_per_nodes_connection(conn[property],
-                                              conn.get("source_nodes", self.spiking_nodes_ids),
-                                              conn.get("target_nodes", self.spiking_nodes_ids),
-                                              self.spiking_nodes_ids, self.tvb_connectivity.region_labels)
+        output = self._get_cached_property_per_node("nodes_connections", property, self.nodes_connections)
+        if output is None:
+            output = {}
+            for conn in self.nodes_connections:
+                output[self._connection_label(conn)] = \
+                    property_per_nodes_connection(conn[property],
+                                                  conn.get("source_nodes", self.spiking_nodes_ids),
+                                                  conn.get("target_nodes", self.spiking_nodes_ids),
+                                                  self.spiking_nodes_ids, *self._get_region_labels_maps())
+            self._set_cached_property_per_node("nodes_connections", property, self.nodes_connections,
+                                               output)
         return output
 
     @property
@@ -315,6 +421,17 @@ class SpikingModelBuilder(object):
         assert delay >= 0.0
         return delay
 
+    def _is_zero_weight_static_connection(self, synapse_model, weight):
+        """Method to check whether a connection has no effect and can be skipped,
+           i.e., if it is of zero weight and of a static synapse model, listed in static_synapse_models.
+           Arguments:
+            synapse_model: the synapse model of the connection
+            weight: the weight of the connection
+           Returns:
+            True if the connection can be skipped, False otherwise
+        """
+        return isinstance(weight, Number) and weight == 0 and synapse_model in self.static_synapse_models
+
     def _assert_within_node_delay(self, delay):
         # TODO: decide about default constraints to minimum delays of the network!
         if delay > self.tvb_dt / 2:
@@ -330,15 +447,14 @@ class SpikingModelBuilder(object):
 
     def _update_spiking_dt(self):
         # The TVB dt should be an integer multiple of the spiking simulator dt:
-        self.spiking_dt = int(np.round(self.tvb_dt / self.tvb_to_spiking_dt_ratio / self.default_min_spiking_dt)) \
+        self.spiking_dt = int(round(self.tvb_dt / self.tvb_to_spiking_dt_ratio / self.default_min_spiking_dt)) \
                           * self.default_min_spiking_dt
 
     def _update_default_min_delay(self):
         # The Spiking Network min delay should be smaller than half the TVB dt,
         # and an integer multiple of the spiking simulator dt
-        self.default_min_delay = np.minimum(
-            np.maximum(self.default_min_delay_ratio * self.spiking_dt, self.min_delay),
-            self.tvb_dt / 2)
+        self.default_min_delay = min(max(self.default_min_delay_ratio * self.spiking_dt, self.min_delay),
+                                     self.tvb_dt / 2)
 
     def _configure_populations(self):
         # Every population must have its own model model, label.
@@ -350,19 +466,23 @@ class SpikingModelBuilder(object):
         self.populations_labels = []
         _populations = []
         for i_pop, population in enumerate(self.populations):
-            _populations.append(dict(self.default_population))
-            _populations[-1].update(population)
+            # Merge the user inputs over the defaults in a single new dict:
+            _populations.append({**self.default_population, **population})
             if len(_populations[-1].get("label", "")) == 0:
                 _populations[-1]["label"] = "Pop%d" % i_pop
             self.populations_labels.append(_populations[-1]["label"])
             if _populations[-1]["nodes"] is None:
                 _populations[-1]["nodes"] = self.spiking_nodes_ids
+            # A set of the nodes' indices for O(1) membership tests:
+            _populations[-1]["_nodes_set"] = set(np.ravel(_populations[-1]["nodes"]).astype("i").tolist())
             _model = _populations[-1]["model"]
             if _model not in self._models:
                 self._models.append(_model)
-            _populations[-1]["scale"] = property_to_fun(_populations[-1]["scale"])
-            _populations[-1]["params"] = property_to_fun(_populations[-1]["params"])
-        self.populations_labels = np.unique(self.populations_labels).tolist()
+            # Property functions are memoized, so that they are evaluated only once per node:
+            _populations[-1]["scale"] = memoize_property_fun(property_to_fun(_populations[-1]["scale"]))
+            _populations[-1]["params"] = memoize_property_fun(property_to_fun(_populations[-1]["params"]))
+        self.populations_labels = list(dict.fromkeys(self.populations_labels))
+        self._populations_labels_set = frozenset(self.populations_labels)
         self._populations = _populations
         return self._populations
 
@@ -371,11 +491,13 @@ class SpikingModelBuilder(object):
         # and that every source/target population is already among the populations to be generated.
         for pop in ["source", "target"]:
             pops_labels = connection.get(pop, None)
-        if pops_labels is None:
-            raise_value_error("No %s population in connection!:\n%s" % (pop, str(connection)))
-        for pop_lbl in ensure_list(pops_labels):
-            assert pop_lbl in self.populations_labels
-        return pops_labels
+            if pops_labels is None:
+                raise_value_error("No %s population in connection!:\n%s" % (pop, str(connection)))
+            for pop_lbl in ensure_list(pops_labels):
+                if pop_lbl not in self._populations_labels_set:
+                    raise_value_error("%s population %s of connection is not among the populations %s!:\n%s"
+                                      % (pop.title(), str(pop_lbl), str(self.populations_labels), str(connection)))
+        return connection
 
     def _configure_connections(self, connections, default_connection):
         # This method sets "weight", "delay" and "receptor_type" synapse properties,
@@ -384,11 +506,11 @@ class SpikingModelBuilder(object):
         _connections = []
         for i_con, connection in enumerate(connections):
             self._assert_connection_populations(connection)
-            temp_conn = dict(default_connection)
-            temp_conn.update(connection)
-            _connections.append(temp_conn)
+            # Merge the user inputs over the defaults in a single new dict:
+            _connections.append({**default_connection, **connection})
             for prop in ["weight", "delay", "receptor_type", "params"]:
-                _connections[i_con][prop] = property_to_fun(_connections[i_con][prop])
+                # Property functions are memoized, so that they are evaluated only once per node (pair):
+                _connections[i_con][prop] = memoize_property_fun(property_to_fun(_connections[i_con][prop]))
             for prop in ["source_neurons", "target_neurons"]:
                 inds_fun = _connections[i_con].get(prop, None)
                 if inds_fun is not None:
@@ -428,6 +550,18 @@ class SpikingModelBuilder(object):
         self._nodes_connections = _nodes_connections
         return self._nodes_connections
 
+    @staticmethod
+    def _device_property_per_node(property, spiking_nodes):
+        # Evaluate a device's property function for every target node,
+        # or, for the common case of a constant property, just repeat it for all target nodes:
+        output = np.empty((len(spiking_nodes),), dtype="O")
+        if callable(property):
+            for i_trg, trg_node in enumerate(spiking_nodes):
+                output[i_trg] = property(trg_node)
+        else:
+            output.fill(property)
+        return output
+
     def _configure_devices(self, devices):
         # Configure devices by
         # the variable model they measure or stimulate, and population(s) they target (pandas.Series)
@@ -439,36 +573,28 @@ class SpikingModelBuilder(object):
             spiking_nodes = device.get("nodes", self.spiking_nodes_ids)
             if spiking_nodes is None:
                 spiking_nodes = self.spiking_nodes_ids
-            # User inputs
-            # ..set/converted to functions
-            weights_fun = property_to_fun(device.get("weights", 1.0))
-            delays_fun = property_to_fun(device.get("delays", 0.0))
-            receptor_type_fun = property_to_fun(device.get("receptor_type",
-                                                           self.default_devices_connection["receptor_type"]))
+            # User inputs, set per target node.
+            # weights and delays might be dictionaries for distributions:
+            weights = self._device_property_per_node(device.get("weights", 1.0),
+                                                     spiking_nodes)  # a function also of self.tvb_weights
+            delays = self._device_property_per_node(device.get("delays", 0.0),
+                                                    spiking_nodes)  # a function also of self.tvb_delays
+            receptor_type = self._device_property_per_node(
+                device.get("receptor_type", self.default_devices_connection["receptor_type"]), spiking_nodes)
             # Default behavior for any region nodes is to target all of the populations' neurons:
+            neurons = np.empty((len(spiking_nodes),), dtype="O")  # filled with None
             neurons_fun = device.get("neurons_fun", None)
             if neurons_fun is not None:
                 neurons_fun = property_to_fun(neurons_fun)
-            # Defaults in arrays:
-            shape = (len(spiking_nodes),)
-            receptor_type = np.tile(self.default_devices_connection["receptor_type"], shape)
-            # weights and delays might be dictionaries for distributions:
-            weights = np.ones(shape).astype("O")
-            delays = np.zeros(shape).astype("O")
-            neurons = np.tile([None], shape).astype("O")
-            # Set now the properties using the above defined functions:
-            for i_trg, trg_node in enumerate(spiking_nodes):
-                weights[i_trg] = weights_fun(trg_node)  # a function also of self.tvb_weights
-                delays[i_trg] = delays_fun(trg_node)    # a function also of self.tvb_delays
-                receptor_type[i_trg] = receptor_type_fun(trg_node)
-                if neurons_fun is not None:
-                    neurons[i_trg] = lambda neurons: neurons_fun(trg_node, neurons)
+                for i_trg, trg_node in enumerate(spiking_nodes):
+                    # Bind the current target node to a function of the neurons:
+                    neurons[i_trg] = partial(neurons_fun, trg_node)
             _devices[-1]["params"] = device.get("params", {})
             _devices[-1]["weights"] = weights
             _devices[-1]["delays"] = delays
             _devices[-1]["receptor_type"] = receptor_type
             _devices[-1]["neurons_fun"] = neurons
-            _devices[-1]["nodes"] = [np.where(self.spiking_nodes_ids == trg_node)[0][0] for trg_node in spiking_nodes]
+            _devices[-1]["nodes"] = [self._id_to_local_index[int(trg_node)] for trg_node in spiking_nodes]
         return _devices
 
     def _configure_output_devices(self):
@@ -481,81 +607,115 @@ class SpikingModelBuilder(object):
 
     def configure(self):
         """Method to condigure the builder taking into consideration the input configurations by the user."""
+        self._invalidate_caches()
         self._configure_populations()
         self._configure_populations_connections()
         self._configure_nodes_connections()
         self._configure_output_devices()
         self._configure_input_devices()
 
+    def build_spiking_populations(self, populations, *args, **kwargs):
+        """Method to build several SpikingPopulation instances, in the given order.
+           Spiking simulator specific builders might override it to create them in fewer calls.
+           Arguments:
+            populations: a sequence of (label, model, size, params) tuples,
+                         with the arguments of build_spiking_population for every population
+            *args, **kwargs: other optional positional or keyword arguments
+           Returns:
+            a list of SpikingPopulation class instances, in the order of the input populations
+        """
+        return [self.build_spiking_population(label, model, size, params=params, *args, **kwargs)
+                for label, model, size, params in populations]
+
     def build_spiking_region_nodes(self, *args, **kwargs):
         """Method to build all spiking populations with each brain region node."""
+        populations = []
         # For every Spiking node
         for node_id, node_label in zip(self.spiking_nodes_ids, self.spiking_nodes_labels):
             self._spiking_brain[node_label] = self.build_spiking_region_node(node_label)
-            # ...and every population in it...
-            for iP, population in enumerate(self._populations):
-                # ...if this population exists in this node...
-                if node_id in population["nodes"]:
-                    # ...generate this population in this node...
-                    size = int(np.round(population["scale"](node_id) * self.population_order))
-                    self._spiking_brain[node_label][population["label"]] = \
-                        self.build_spiking_population(population["label"], population["model"], size,
-                                                      params=population["params"](node_id),
-                                                      *args, **kwargs)
+            # ...and every population that exists in this node...
+            node_populations = [population for population in self._populations
+                                if int(node_id) in population["_nodes_set"]]
+            # ...compute the sizes of all of them at once...
+            sizes = scales_to_sizes([property_value(population["scale"], node_id)
+                                     for population in node_populations], self.population_order)
+            for population, size in zip(node_populations, sizes):
+                populations.append((node_label, population["label"], population["model"], size,
+                                    property_value(population["params"], node_id)))
+        # ...and generate all populations, in this order:
+        spiking_populations = self.build_spiking_populations([population[1:] for population in populations],
+                                                             *args, **kwargs)
+        for (node_label, label, _, _, _), spiking_population in zip(populations, spiking_populations):
+            self._spiking_brain[node_label][label] = spiking_population
 
     def connect_within_node_spiking_populations(self):
         """Method to connect all populations withing each Spiking brain region node."""
         # For every different type of connections between distinct Spiking nodes' populations
-        for i_conn, conn in enumerate(ensure_list(self._populations_connections)):
+        for i_conn, conn in enumerate(self._populations_connections):
+            # Bind once the properties that do not depend on the node:
+            srcs = ensure_list(conn["source"])
+            trgs = ensure_list(conn["target"])
+            src_inds = conn["source_inds"]
+            trg_inds = conn["target_inds"]
+            conn_spec = conn["conn_spec"]
             # ...and for every brain region node where this connection will be created:
             for node_index in conn["nodes"]:
-                i_node = np.where(self.spiking_nodes_ids == node_index)[0][0]
+                weight = property_value(conn['weight'], node_index)
+                delay = self._assert_delay(property_value(conn['delay'], node_index))
+                if self._is_zero_weight_static_connection(conn["synapse_model"], weight):
+                    # ...skip the nodes where the populations are not coupled (zero weight of a static synapse)...
+                    continue
+                i_node = self._id_to_local_index[int(node_index)]
                 # ...create a synapse parameters dictionary, from the configured inputs:
                 syn_spec = self.set_synapse(conn["synapse_model"],
-                                            conn['weight'](node_index),
-                                            self._assert_delay(conn['delay'](node_index)),
-                                            conn['receptor_type'](node_index),
-                                            conn["params"](node_index)
+                                            weight,
+                                            delay,
+                                            property_value(conn['receptor_type'], node_index),
+                                            property_value(conn["params"], node_index)
                                             )
-                # ...and for every combination of source...
-                for pop_src in ensure_list(conn["source"]):
-                    # ...and target populations of this connection...
-                    for pop_trg in ensure_list(conn["target"]):
-                        # ...connect the two populations:
-                        self.connect_two_populations(
-                            self._spiking_brain[i_node][pop_src], conn["source_inds"],
-                            self._spiking_brain[i_node][pop_trg], conn["target_inds"],
-                            conn["conn_spec"], syn_spec
-                        )
+                spiking_node = self._spiking_brain[i_node]
+                # ...and connect every combination of source and target populations of this connection:
+                self.connect_populations([spiking_node[pop_src] for pop_src in srcs], src_inds,
+                                         [spiking_node[pop_trg] for pop_trg in trgs], trg_inds,
+                                         conn_spec, syn_spec)
 
     def connect_spiking_region_nodes(self):
         """Method to connect all Spiking brain region nodes among them."""
         # For every different type of connections between distinct Spiking region nodes' populations
-        for i_conn, conn in enumerate(ensure_list(self._nodes_connections)):
+        for i_conn, conn in enumerate(self._nodes_connections):
+            # Bind once the properties that do not depend on the nodes:
+            srcs = ensure_list(conn["source"])
+            trgs = ensure_list(conn["target"])
+            src_inds = conn["source_inds"]
+            trg_inds = conn["target_inds"]
+            conn_spec = conn["conn_spec"]
+            # Get once the target populations of every target spiking brain region node:
+            trg_pops = [(target_index,
+                         [self._spiking_brain[self._id_to_local_index[int(target_index)]][conn_trg]
+                          for conn_trg in trgs])
+                        for target_index in conn["target_nodes"]]
             # ...form the connection for every distinct pair of Spiking nodes
             for source_index in conn["source_nodes"]:
-                # ...get the source spiking brain region indice:
-                i_source_node = np.where(self.spiking_nodes_ids == source_index)[0][0]
-                for target_index in conn["target_nodes"]:
-                    # ...get the target spiking brain region indice:
-                    i_target_node = np.where(self.spiking_nodes_ids == target_index)[0][0]
-                    # ...create a synapse parameters dictionary, from the configured inputs:
-                    syn_spec = self.set_synapse(conn["synapse_model"],
-                                                conn["weight"](source_index, target_index),
-                                                conn["delay"](source_index, target_index),
-                                                conn["receptor_type"](source_index, target_index)
-                                                )
+                # ...get the source populations of the source spiking brain region node:
+                source_node = self._spiking_brain[self._id_to_local_index[int(source_index)]]
+                src_pops = [source_node[conn_src] for conn_src in srcs]
+                for target_index, target_pops in trg_pops:
                     if source_index != target_index:
                         # ...and as long as this is not a within node connection...
-                        for conn_src in ensure_list(conn["source"]):
-                            # ...and for every combination of source...
-                            src_pop = self._spiking_brain[i_source_node][conn_src]
-                            for conn_trg in ensure_list(conn["target"]):
-                                # ...and target population...
-                                trg_pop = self._spiking_brain[i_target_node][conn_trg]
-                                self.connect_two_populations(src_pop, conn["source_inds"],
-                                                             trg_pop, conn["target_inds"],
-                                                             conn['conn_spec'], syn_spec)
+                        weight = property_value(conn["weight"], source_index, target_index)
+                        if self._is_zero_weight_static_connection(conn["synapse_model"], weight):
+                            # ...skip the pairs of nodes without any coupling (e.g., zero TVB weights),
+                            # as long as the synapse is static...
+                            continue
+                        # ...create a synapse parameters dictionary, from the configured inputs:
+                        syn_spec = self.set_synapse(conn["synapse_model"],
+                                                    weight,
+                                                    property_value(conn["delay"], source_index, target_index),
+                                                    property_value(conn["receptor_type"], source_index, target_index)
+                                                    )
+                        # ...and connect every combination of source and target populations:
+                        self.connect_populations(src_pops, src_inds, target_pops, trg_inds,
+                                                 conn_spec, syn_spec)
 
     def build_spiking_brain(self):
         """Method to build and connect all Spiking brain region nodes,
@@ -571,11 +731,11 @@ class SpikingModelBuilder(object):
            - the variable they measure or stimulate (pandas.Series), and the
            - population(s) (pandas.Series), and
            - brain region nodes (pandas.Series) they target."""
-        _devices = Series()
-        for device in devices:
-            _devices = _devices.append(
-                            self.build_and_connect_devices(device))
-        return _devices
+        # Concatenate once, instead of appending to a growing Series per device:
+        _devices = [self.build_and_connect_devices(device) for device in devices]
+        if len(_devices):
+            return concat(_devices)
+        return Series(dtype=object)
 
     def build_and_connect_output_devices(self):
         """Method to build and connect output devices, organized by
@@ -610,14 +770,15 @@ class SpikingModelBuilder(object):
         return self.build()
 
 
-def node_key_index_and_label(node, labels):
+def node_key_index_and_label(node, labels, labels_to_indices=None):
     if isinstance(node, string_types):
-        try:
-            i_node = labels.index(node)
-            label = node
-            node_key = "%d-%s" % (i_node, node)
-        except:
+        if labels_to_indices is None:
+            labels_to_indices = dict(zip(labels, range(len(labels))))
+        i_node = labels_to_indices.get(node, None)
+        if i_node is None:
             raise_value_error("Node %s is not a region node modeled in Spiking Simulator!" % node)
+        label = node
+        node_key = "%d-%s" % (i_node, node)
     else:
         try:
             label = labels[node]
@@ -628,37 +789,80 @@ def node_key_index_and_label(node, labels):
     return node_key, i_node, label
 
 
+def scales_to_sizes(scales, population_order):
+    """This function converts a sequence of populations' scales
+       to the respective numbers of neurons (integers), for the given population order.
+    """
+    return np.rint(np.asarray(scales, dtype="f8") * population_order).astype("i").tolist()
+
+
+def memoize_property_fun(fun):
+    """This function wraps a property function of region nodes' indices,
+       so that it is evaluated only once per distinct node index, or pair of nodes' indices.
+       Constant property functions are returned as they are.
+    """
+    if hasattr(fun, "_constant"):
+        return fun
+    cache = {}
+
+    def memoized_fun(*args):
+        try:
+            return cache[args]
+        except KeyError:
+            output = cache[args] = fun(*args)
+            return output
+        except TypeError:
+            # Unhashable arguments cannot be cached:
+            return fun(*args)
+
+    return memoized_fun
+
+
+def property_value(property_fun, *args):
+    """This function returns the value of a property function for the input node(s) argument(s),
+       directly, without calling the function, if the latter is tagged as constant by property_to_fun.
+    """
+    if hasattr(property_fun, "_constant"):
+        return property_fun._constant
+    return property_fun(*args)
+
+
 # The functions below are used in order to return the builder's properties
 # per spiking node or spiking nodes' connection
 
 
-def property_per_node(property, nodes, nodes_labels):
-    if hasattr(property, "__call__") and nodes:
-        property_per_node = OrderedDict()
+def property_per_node(property, nodes, nodes_labels, labels_to_indices=None):
+    if callable(property) and nodes is not None and np.size(nodes) > 0:
+        property_per_node = {}
         for node in nodes:
-            node_key, node_index = node_key_index_and_label(node, nodes_labels)[:2]
+            node_key, node_index = node_key_index_and_label(node, nodes_labels, labels_to_indices)[:2]
             property_per_node[node_key] = property(node_index)
         return property_per_node
     else:
         return property
 
 
-def property_per_nodes_connection(property, source_nodes, target_nodes, spiking_nodes_ids, nodes_labels):
-    if hasattr(property, "__call__"):
+def property_per_nodes_connection(property, source_nodes, target_nodes, spiking_nodes_ids, nodes_labels,
+                                  labels_to_indices=None):
+    if callable(property):
+        # Deduplicate the nodes by hashing, without sorting them:
         if source_nodes is None:
             source_nodes = spiking_nodes_ids
         else:
-            source_nodes = np.unique(source_nodes)
+            source_nodes = unique(np.ravel(source_nodes))
         if target_nodes is None:
             target_nodes = spiking_nodes_ids
         else:
-            target_nodes = np.unique(target_nodes)
-        property_per_nodes_connection = OrderedDict()
+            target_nodes = unique(np.ravel(target_nodes))
+        # Resolve the target nodes' indices and labels once, for all source nodes:
+        targets = [node_key_index_and_label(target_node, nodes_labels, labels_to_indices)[1:]
+                   for target_node in target_nodes]
+        property_per_nodes_connection = {}
         for source_node in source_nodes:
-            source_index, source_label = node_key_index_and_label(source_node, nodes_labels)[1:]
-            for target_node in target_nodes:
-                target_index, target_label = node_key_index_and_label(target_node, nodes_labels)[1:]
-                node_connection_label = "%d.%s->%d.%s" % (source_index, source_label, target_index, target_label)
+            source_index, source_label = node_key_index_and_label(source_node, nodes_labels, labels_to_indices)[1:]
+            source_prefix = "%d.%s->" % (source_index, source_label)
+            for target_index, target_label in targets:
+                node_connection_label = "%s%d.%s" % (source_prefix, target_index, target_label)
                 property_per_nodes_connection[node_connection_label] = property(source_index, target_index)
         return property_per_nodes_connection
     else:
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from collections import OrderedDict
 from tvb_multiscale.core.config import CONFIGURED
 from tvb_multiscale.core.spiking_models.builders.base import SpikingModelBuilder
 from tvb_multiscale.core.spiking_models.builders.templates import tvb_weight, tvb_delay
@@ -116,7 +115,7 @@ class RateWWAMPANMDAGABABuilder(SpikingModelBuilder):
         # Creating  devices to be able to observe NEST activity:
         # Labels have to be different
         self.output_devices = []
-        connections = OrderedDict({})
+        connections = {}
         #                   label <- target population
         connections["AMPA spikes"] = "AMPA"
         connections["NMDA spikes"] = "NMDA"
@@ -125,7 +124,7 @@ class RateWWAMPANMDAGABABuilder(SpikingModelBuilder):
         params["interval"] = self.monitor_period
         self.output_devices.append({"model": "spike_multimeter", "params": params,
                                     "connections": connections, "nodes": None})  # None means "all"
-        connections = OrderedDict({})
+        connections = {}
         #             label <- target population
         connections["AMPA"] = "AMPA"
         connections["NMDA"] = "NMDA"
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from collections import OrderedDict
 from tvb_multiscale.core.config import CONFIGURED
 from tvb_multiscale.core.spiking_models.builders.base import SpikingModelBuilder
 from tvb_multiscale.core.spiking_models.builders.templates import scale_tvb_weight, tvb_delay
@@ -106,7 +105,7 @@ class WWAMPANMDAGABABuilder(SpikingModelBuilder):
 
         # Creating  devices to be able to observe NEST activity:
         self.output_devices = []
-        connections = OrderedDict({})
+        connections = {}
         #                   label <- target population
         connections["AMPA spikes"] = "AMPA"
         connections["NMDA spikes"] = "NMDA"
@@ -114,7 +113,7 @@ class WWAMPANMDAGABABuilder(SpikingModelBuilder):
         params = dict(self.config.NEST_OUTPUT_DEVICES_PARAMS_DEF["spike_detector"])
         self.output_devices.append({"model": "spike_detector", "params": params,
                                     "connections": connections, "nodes": None})  # None means "all"
-        connections = OrderedDict({})
+        connections = {}
         #               label <- target population
         connections["AMPA"] = "AMPA"
         connections["NMDA"] = "NMDA"
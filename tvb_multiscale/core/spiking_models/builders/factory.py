@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
+from inspect import signature
 
 import numpy as np
-from pandas import Series
+from pandas import Series, concat
 from six import string_types
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
@@ -19,25 +20,45 @@ def log_path(name, logger=LOG):
     logger.info("%s: %s" % (name, os.environ.get(name, "")))
 
 
-def _get_device_props_with_correct_shape(device, shape):
-    # This function sets device connectivity properties to the desired shape.
-    def _assert_conn_params_shape(p, p_name, shape):
-        if isinstance(p, dict):
-            return np.tile(p, shape)
-        elif not isinstance(p, np.ndarray):
-            p = np.array(p)
-        if np.any(p.shape != shape):
-            if p.size == 1:
-                return np.tile(p, shape)
-            else:
+# The connectivity properties of devices and their default values:
+_DEVICE_PROPS_DEFAULTS = (("weights", 1.0), ("delays", 0.0), ("receptor_type", None), ("neurons_fun", None))
+
+
+def _get_device_props_for_single_node(device):
+    # This function returns the device connectivity properties for a single target node, without expanding them.
+    props = []
+    for p_name, default in _DEVICE_PROPS_DEFAULTS:
+        p = device.get(p_name, default)
+        if isinstance(p, (list, tuple, np.ndarray)):
+            p = np.asarray(p)
+            if p.size != 1:
                 raise_value_error("Device %s are neither of shape (n_devices, n_nodes) = %s"
-                                  "nor of size 1:\n%s" % (p_name, str(shape), str(p)))
-        return p
+                                  "nor of size 1:\n%s" % (p_name, str((1,)), str(p)))
+            p = p.item()
+        props.append(p)
+    return props
 
-    return _assert_conn_params_shape(device.get("weights", 1.0), "weights", shape), \
-           _assert_conn_params_shape(device.get("delays", 0.0), "delays", shape), \
-           _assert_conn_params_shape(device.get("receptor_type", None), "receptor_type", shape), \
-           _assert_conn_params_shape(device.get("neurons_fun", None), "neurons_fun", shape)
+
+def _get_device_props_with_correct_shape(device, shape):
+    # This function sets device connectivity properties to the desired shape,
+    # expanding size 1 properties as read-only broadcasted views, without copying:
+    props = []
+    for p_name, default in _DEVICE_PROPS_DEFAULTS:
+        p = device.get(p_name, default)
+        if isinstance(p, dict):
+            arr = np.empty((), dtype=object)
+            arr[()] = p
+            p = np.broadcast_to(arr, shape)
+        else:
+            p = np.asarray(p)
+            if p.shape != shape:
+                if p.size == 1:
+                    p = np.broadcast_to(p.reshape((1,) * len(shape)), shape)
+                else:
+                    raise_value_error("Device %s are neither of shape (n_devices, n_nodes) = %s"
+                                      "nor of size 1:\n%s" % (p_name, str(shape), str(p)))
+        props.append(p)
+    return props
 
 
 def _get_connections(device, spiking_nodes):
@@ -52,7 +73,16 @@ def _get_connections(device, spiking_nodes):
         device_target_nodes = spiking_nodes
     else:
         device_target_nodes = spiking_nodes[device_target_nodes]
-    return connections, device_target_nodes
+    return tuple(connections.items()), device_target_nodes
+
+
+def _device_sets_to_series(device_sets):
+    # Wrap a dict of DeviceSets into a Series at once,
+    # filling an object array element by element, so that the DeviceSets are not unpacked to a 2D array:
+    values = np.empty((len(device_sets),), dtype=object)
+    for i_set, device_set in enumerate(device_sets.values()):
+        values[i_set] = device_set
+    return Series(values, index=list(device_sets.keys()))
 
 
 def build_device(device, create_device_fun, config=CONFIGURED, **kwargs):
@@ -83,6 +113,30 @@ def build_device(device, create_device_fun, config=CONFIGURED, **kwargs):
                          "Device has to be a device model or dict!" % str(device))
 
 
+def _creates_multiple_devices(create_device_fun):
+    # This function checks whether create_device_fun can create several devices with a single call,
+    # i.e., whether it accepts a number_of_devices argument, which is specific to some spiking simulators:
+    try:
+        return "number_of_devices" in signature(create_device_fun).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def connect_device_to_populations(device, connect_device_fun, node, populations, inds_fun,
+                                  weight=1.0, delay=0.0, receptor_type=None, config=CONFIGURED, **kwargs):
+    """This method will connect an already built device to populations of a SpikingRegionNode
+       based on the input connect_device_fun function, which is specific to every spiking simulator.
+       See build_and_connect_device for the arguments.
+       Returns:
+        the connected Device class instance
+    """
+    for pop in populations:
+        device = connect_device_fun(device, node[pop], inds_fun,
+                                    weight, delay, receptor_type, config=config, **kwargs)
+    device._number_of_connections = device.number_of_connections
+    return device
+
+
 def build_and_connect_device(device, create_device_fun, connect_device_fun, node, populations, inds_fun,
                              weight=1.0, delay=0.0, receptor_type=None,
                              config=CONFIGURED, **kwargs):
@@ -94,7 +148,7 @@ def build_and_connect_device(device, create_device_fun, connect_device_fun, node
         create_device_fun: a function to build the device
         connect_device_fun: a function to connect the device
         node: the target SpikingRegionNode class instance
-        populations: target populations' labels:
+        populations: a list of target populations' labels
         inds_fun: a function to select a subset of each population's neurons
         weight: the weight of the connection. Default = 1.0
         delay: the delay of the connection. Default = 0.0
@@ -105,12 +159,9 @@ def build_and_connect_device(device, create_device_fun, connect_device_fun, node
        Returns:
         the built and connected Device class instance
     """
-    device = build_device(device, create_device_fun, config=config, **kwargs)
-    for pop in ensure_list(populations):
-        device = connect_device_fun(device, node[pop], inds_fun,
-                                    weight, delay, receptor_type, config=config, **kwargs)
-    device._number_of_connections = device.number_of_connections
-    return device
+    return connect_device_to_populations(build_device(device, create_device_fun, config=config, **kwargs),
+                                         connect_device_fun, node, populations, inds_fun,
+                                         weight, delay, receptor_type, config=config, **kwargs)
 
 
 def build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect_device_fun, spiking_nodes,
@@ -118,27 +169,44 @@ def build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect
     """This function will create a DeviceSet for a measuring (output) or input (stimulating) quantity,
        whereby each device will target one and only SpikingRegionNode,
        e.g. as it is the case for measuring Spiking populations from specific TVB nodes."""
-    devices = Series()
+    devices = {}
     # Determine the connections from variables to measure/stimulate to Spiking node populations
     connections, device_target_nodes = _get_connections(device_dict, spiking_nodes)
     # Determine the device's parameters and connections' properties
-    weights, delays, receptor_types, neurons_funs = \
-        _get_device_props_with_correct_shape(device_dict, (len(device_target_nodes),))
+    if len(device_target_nodes) == 1:
+        # ...without expanding them, if there is only one target node:
+        weights, delays, receptor_types, neurons_funs = \
+            [[p] for p in _get_device_props_for_single_node(device_dict)]
+    else:
+        weights, delays, receptor_types, neurons_funs = \
+            _get_device_props_with_correct_shape(device_dict, (len(device_target_nodes),))
+    # Get the target region nodes' labels once for all population variables:
+    nodes_labels = [node.label for node in device_target_nodes]
     # For every Spiking population variable to be stimulated or measured...
-    for pop_var, populations in connections.items():
+    for pop_var, populations in connections:
+        populations = ensure_list(populations)
         # This set of devices will be for variable pop_var...
-        devices[pop_var] = DeviceSet(pop_var, device_dict["model"])
+        device_set = {}
+        # create the devices of all target region nodes at once, if the spiking simulator allows it...
+        if len(device_target_nodes) > 1 and _creates_multiple_devices(create_device_fun):
+            nodes_devices = build_device(device_dict, create_device_fun, config=config,
+                                         number_of_devices=len(device_target_nodes), **kwargs)
+        else:
+            # ...or, otherwise, one at a time:
+            nodes_devices = [build_device(device_dict, create_device_fun, config=config, **kwargs)
+                             for _ in device_target_nodes]
         # and for every target region node...
-        for i_node, node in enumerate(device_target_nodes):
+        for i_node, (node, node_label, device) in enumerate(zip(device_target_nodes, nodes_labels, nodes_devices)):
             # ...and population group...
-            # ...create a device and connect it:
-            devices[pop_var][node.label] = \
-                build_and_connect_device(device_dict, create_device_fun, connect_device_fun,
-                                         node, populations, neurons_funs[i_node],
-                                         weights[i_node], delays[i_node], receptor_types[i_node],
-                                         config=config, **kwargs)
+            # ...connect its device:
+            device_set[node_label] = \
+                connect_device_to_populations(device, connect_device_fun,
+                                              node, populations, neurons_funs[i_node],
+                                              weights[i_node], delays[i_node], receptor_types[i_node],
+                                              config=config, **kwargs)
+        devices[pop_var] = DeviceSet(pop_var, device_dict["model"], device_set)
         devices[pop_var].update()
-    return devices
+    return _device_sets_to_series(devices)
 
 
 def build_and_connect_devices_one_to_many(device_dict, create_device_fun, connect_device_fun, spiking_nodes,
@@ -147,32 +215,35 @@ def build_and_connect_devices_one_to_many(device_dict, create_device_fun, connec
        whereby each device will target more than one SpikingRegionNode instances,
        e.g. as it is the case a TVB "proxy" node,
        stimulating several of the SpikingRegionNodes in the spiking network."""
-    devices = Series()
+    devices = {}
     # Determine the connections from variables to measure/stimulate to Spiking node populations
     connections, device_target_nodes = _get_connections(device_dict, spiking_nodes)
     # Determine the device's parameters and connections' properties
     weights, delays, receptor_types, neurons_funs = \
         _get_device_props_with_correct_shape(device_dict, (len(names), len(device_target_nodes)))
     # For every Spiking population variable to be stimulated or measured...
-    for pop_var, populations in connections.items():
+    for pop_var, populations in connections:
+        populations = ensure_list(populations)
         # This set of devices will be for variable pop_var...
-        devices[pop_var] = DeviceSet(pop_var, device_dict["model"])
+        device_set = {}
         # and for every target region node...
         for i_dev, dev_name in enumerate(names):
             # ...and populations' group...
             # create a device
-            devices[pop_var][dev_name] = build_device(device_dict, create_device_fun, config=config, **kwargs)
+            device = build_device(device_dict, create_device_fun, config=config, **kwargs)
             # ...and loop through the target region nodes...
             for i_node, node in enumerate(device_target_nodes):
                 # ...and populations' groups...
                 # ...to connect it:
                 for pop in populations:
-                    devices[pop_var][dev_name] = \
-                       connect_device_fun(devices[pop_var][dev_name], node[pop], neurons_funs[i_dev, i_node],
+                    device = \
+                       connect_device_fun(device, node[pop], neurons_funs[i_dev, i_node],
                                           weights[i_dev, i_node], delays[i_dev, i_node], receptor_types[i_dev, i_node],
                                           config=config, **kwargs)
+            device_set[dev_name] = device
+        devices[pop_var] = DeviceSet(pop_var, device_dict["model"], device_set)
         devices[pop_var].update()
-    return devices
+    return _device_sets_to_series(devices)
 
 
 def build_and_connect_devices(devices_input_dicts, create_device_fun, connect_device_fun, spiking_nodes,
@@ -182,18 +253,21 @@ def build_and_connect_devices(devices_input_dicts, create_device_fun, connect_de
        the variable they measure or stimulate, and population(s) they target (pandas.Series)
        and target node (pandas.Series) where they refer to.
     """
-    devices = Series()
+    devices = []
     for device_dict in ensure_list(devices_input_dicts):
         # For every distinct quantity to be measured from Spiking or stimulated towards Spiking nodes...
         dev_names = device_dict.get("names", None)
         if dev_names is None:  # If no devices' names are given...
-            devices = devices.append(
-                            build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect_device_fun,
-                                                                 spiking_nodes, config=config, **kwargs)
-                                              )
+            devices.append(
+                build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect_device_fun,
+                                                     spiking_nodes, config=config, **kwargs)
+                          )
         else:
-            devices = devices.append(
-                            build_and_connect_devices_one_to_many(device_dict, create_device_fun, connect_device_fun,
-                                                                  spiking_nodes, dev_names, config=config, **kwargs)
-                                              )
-    return devices
+            devices.append(
+                build_and_connect_devices_one_to_many(device_dict, create_device_fun, connect_device_fun,
+                                                      spiking_nodes, dev_names, config=config, **kwargs)
+                          )
+    # Concatenate all the DeviceSets' Series at once:
+    if len(devices):
+        return concat(devices)
+    return Series(dtype=object)
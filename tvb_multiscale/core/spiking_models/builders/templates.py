@@ -111,6 +111,10 @@ def tvb_delay(source_node, target_node, tvb_delays):
     return tvb_delays[source_node, target_node]
 
 
+def bounded_tvb_delay(source_node, target_node, tvb_delays, min_delay):
+    return np.maximum(min_delay, tvb_delays[source_node, target_node])
+
+
 def scale_tvb_delay(source_node, target_node, tvb_delays, scale=1.0):
     return scale * tvb_delays[source_node, target_node]
 
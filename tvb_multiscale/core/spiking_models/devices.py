@@ -10,7 +10,8 @@ import numpy as np
 
 from tvb_multiscale.core.config import initialize_logger, LINE
 
-from tvb_multiscale.core.utils.data_structures_utils import filter_events, summarize, flatten_neurons_inds_in_DataArray
+from tvb_multiscale.core.utils.data_structures_utils import \
+    filter_events, summarize, flatten_neurons_inds_in_DataArray, concat_DataArrays
 
 from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
 from tvb.contrib.scripts.utils.data_structures_utils import \
@@ -657,7 +658,7 @@ class SpikeRecorder(OutputDevice):
                                                         spikes_kernel=spikes_kernel, mode="total",
                                                         name=name, **kwargs) / n_neurons
         else:
-            return xr.DataArray(0.0 * time, dims=["Time"], coords={"Time": time}, name=name)
+            return xr.DataArray(np.zeros(np.shape(time)), dims=["Time"], coords={"Time": time}, name=name)
 
 
 class Multimeter(OutputDevice):
@@ -1265,7 +1266,7 @@ class SpikeMultimeter(Multimeter, SpikeRecorder):
                                                             spikes_kernel=spikes_kernel, mode="total",
                                                             name=name, **kwargs) / n_neurons
         else:
-            return np.array([0.0 *time]*self.number_of_spikes_var)
+            return np.zeros((self.number_of_spikes_var, ) + np.shape(time))
 
 
 OutputDeviceDict = {"spike_recorder": SpikeRecorder,
@@ -1369,7 +1370,7 @@ class DeviceSet(pd.Series):
             values = list(values_dict.values())
             if len(values) == 0:
                 return xr.DataArray([])
-            output = xr.concat(values, dim=pd.Index(dims, name=concatenation_index_name))
+            output = concat_DataArrays(values, pd.Index(dims, name=concatenation_index_name))
             output.name = name
             return output
         else:
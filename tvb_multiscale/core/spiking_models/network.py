@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
 import pandas as pd
-import xarray as xr
 import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger, LINE
 from tvb_multiscale.core.spiking_models.region_node import SpikingRegionNode
 from tvb_multiscale.core.spiking_models.devices import DeviceSet, OutputSpikeDeviceDict
+from tvb_multiscale.core.utils.data_structures_utils import concat_DataArrays
 
 from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
 
@@ -302,7 +302,7 @@ class SpikingNetwork(object):
                populations_devices.append(pop_label)
                equal_shape_per_population = pop_spike_device.shape == shape
             if equal_shape_per_population:
-                rates = xr.concat(rates, dim=pd.Index(list(spike_devices.index), name=devices_dim_name))
+                rates = concat_DataArrays(rates, pd.Index(list(spike_devices.index), name=devices_dim_name))
                 if rates.size == 0:  # In case there is nothing to measure in Spiking Network
                     rates.name = name
                     return rates, spike_devices
@@ -430,7 +430,7 @@ class SpikingNetwork(object):
             data[-1].name = device_name
             equal_shape_per_population = multimeters[device_name].shape == shape
         if equal_shape_per_population:
-            data = xr.concat(data, dim=pd.Index(populations_devices, name=devices_dim_name))
+            data = concat_DataArrays(data, pd.Index(populations_devices, name=devices_dim_name))
             if data.size == 0:  # In case there is nothing to measure in Spiking Network
                 data.name = name
                 return data
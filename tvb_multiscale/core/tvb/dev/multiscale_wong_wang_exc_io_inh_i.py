@@ -419,7 +419,7 @@ class MultiscaleWongWangExcIOInhI(ReducedWongWangExcIOInhI, SpikingWongWangExcIO
             state_variables = \
                 self.update_non_state_variables(state_variables, coupling, local_coupling, use_numba=False)
 
-        derivative = 0.0 * state_variables
+        derivative = numpy.zeros_like(state_variables)
 
         for ii in range(state_variables[0].shape[0]):
 
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from copy import deepcopy
+from functools import lru_cache
 from six import string_types
 
 import numpy as np
@@ -14,6 +16,24 @@ from tvb.simulator.models.reduced_wong_wang_exc_io_inh_i import ReducedWongWangE
 from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
 
 
+@lru_cache(maxsize=4)
+def _load_connectivity(filepath):
+    """Read a Connectivity from file only once per filepath.
+       Callers have to deepcopy the returned Connectivity before modifying it."""
+    return Connectivity.from_file(filepath)
+
+
+def _percentile(values, q):
+    """Linearly interpolated q-th percentile of all values (as numpy.percentile does by default),
+       computed by partial selection of only the two order statistics needed."""
+    values = np.ravel(values)
+    position = q / 100.0 * (values.size - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, values.size - 1)
+    selected = np.partition(values, (lower, upper))
+    return selected[lower] + (selected[upper] - selected[lower]) * (position - lower)
+
+
 class SimulatorBuilder(object):
 
     """SimulatorBuilder is an opinionated builder for a TVB Simulator, adjusted for cosimulation.
@@ -43,6 +63,12 @@ class SimulatorBuilder(object):
     monitor_period = 1.0
     config = CONFIGURED
 
+    # The connectivity's (region x region) matrices, handled together:
+    _connectivity_matrices = ("weights", "tract_lengths")
+
+    # The last connectivity configured from file, per file path and connectivity settings, shared by all builders:
+    _configured_connectivity = {}
+
     def __init__(self):
         self.config = CONFIGURED
         self.connectivity = CONFIGURED.DEFAULT_CONNECTIVITY_ZIP
@@ -57,18 +83,11 @@ class SimulatorBuilder(object):
         self.noise_strength = 0.001
         self.monitor_period = 1.0
 
-    def build(self, **model_params):
-        """This method will build the TVB simulator, based on the builder's properties.
-           Arguments:
-            - **model_params: keyword arguments to modify the default model parameters
-           Returns:
-            - the TVB simulator built, but not yet configured.
-        """
-        # Load, normalize and configure connectivity
-        if isinstance(self.connectivity, string_types):
-            connectivity = Connectivity.from_file(self.connectivity)
-        else:
-            connectivity = self.connectivity
+    def _connectivity_settings(self):
+        return (self.dt, self.remove_self_connections, self.scale_connectivity_weights, self.symmetric_connectome,
+                self.scale_connectivity_weights_by_percentile, self.ceil_connectivity, self.delays_flag)
+
+    def _configure_connectivity(self, connectivity):
         # Given that
         # idelays = numpy.rint(delays / dt).astype(numpy.int32)
         # and delays = tract_lengths / speed
@@ -79,16 +98,47 @@ class SimulatorBuilder(object):
         if isinstance(self.scale_connectivity_weights, string_types):
             connectivity.weights = connectivity.scaled_weights(mode=self.scale_connectivity_weights)
         if self.symmetric_connectome:
-            connectivity.weights = np.sqrt(connectivity.weights * connectivity.weights.T)
-            connectivity.tract_lengths = np.sqrt(connectivity.tract_lengths * connectivity.tract_lengths.T)
+            for attr in self._connectivity_matrices:
+                # Take the square root in place of the product's new array:
+                matrix = getattr(connectivity, attr)
+                matrix = matrix * matrix.T
+                setattr(connectivity, attr, np.sqrt(matrix, out=matrix))
         if self.scale_connectivity_weights_by_percentile is not None:
-            connectivity.weights /= np.percentile(connectivity.weights, self.scale_connectivity_weights_by_percentile)
+            connectivity.weights /= _percentile(connectivity.weights, self.scale_connectivity_weights_by_percentile)
         if self.ceil_connectivity and self.ceil_connectivity > 0.0:
-            connectivity.weights[connectivity.weights > self.ceil_connectivity] = self.ceil_connectivity
+            np.minimum(connectivity.weights, self.ceil_connectivity, out=connectivity.weights)
         if not self.delays_flag:
             connectivity.configure()  # to set speed
-            connectivity.tract_lengths = minimum_tract_length * np.ones(connectivity.tract_lengths.shape)
+            connectivity.tract_lengths = np.full(connectivity.tract_lengths.shape, minimum_tract_length)
         connectivity.configure()
+        return connectivity
+
+    def build_connectivity(self):
+        """This method will load, normalize and configure the connectivity, based on the builder's properties.
+           A connectivity read from file is configured only once for the same settings
+           (e.g., across a parameter sweep of the model), and a copy of it is returned every time.
+           Returns:
+            - the configured TVB Connectivity.
+        """
+        if not isinstance(self.connectivity, string_types):
+            return self._configure_connectivity(self.connectivity)
+        key = (self.connectivity, self._connectivity_settings())
+        connectivity = SimulatorBuilder._configured_connectivity.get(key)
+        if connectivity is None:
+            # The Connectivity read from file is cached too, and, therefore, it is copied before configuring it:
+            connectivity = self._configure_connectivity(deepcopy(_load_connectivity(self.connectivity)))
+            SimulatorBuilder._configured_connectivity = {key: connectivity}
+        return deepcopy(connectivity)
+
+    def build(self, **model_params):
+        """This method will build the TVB simulator, based on the builder's properties.
+           Arguments:
+            - **model_params: keyword arguments to modify the default model parameters
+           Returns:
+            - the TVB simulator built, but not yet configured.
+        """
+        # Load, normalize and configure connectivity
+        connectivity = self.build_connectivity()
 
         # Build model:
         model = self.model(**model_params)
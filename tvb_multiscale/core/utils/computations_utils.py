@@ -161,8 +161,9 @@ def tvb_TimeSeries_correlation(ts, corrfun=Pearson, force_dims=4):
     new_dims = list(corrs.dims)
     corrs = corrs.transpose(*tuple(new_dims[0::2] + new_dims[1::2]))  # Put variables in front of regions
     if force_dims is not None:  # Compute the mean over possible 4th dimension ("Mode", or "Neuron")
-        while len(corrs.dims) > force_dims:
-            corrs = corrs.mean(axis=-1)
+        if len(corrs.dims) > force_dims:
+            # Average over all extra trailing dimensions in one reduction, without intermediate DataArrays:
+            corrs = corrs.mean(dim=list(corrs.dims[force_dims:]))
     return corrs
 
 
@@ -179,17 +180,17 @@ def compute_tvb_spike_rate_corrs(tvb_rates_ts, transient=0.0):
 
 
 def compute_time_from_spike_times(spikes, monitor_period):
-    t_start = np.inf
-    t_stop = -np.inf
-    for i_pop, (pop_label, pop_spikes) in enumerate(spikes.iteritems()):
-        for reg_label, reg_spikes in pop_spikes.iteritems():
-            if len(reg_spikes["times"]) > 0:
-                temp = np.min(reg_spikes["times"]).item()
-                if temp < t_start:
-                    t_start = temp
-                temp = np.max(reg_spikes["times"]).item()
-                if temp > t_stop:
-                    t_stop = temp
+    # Gather the spikes' times of all populations and regions to compute their extremes in one pass:
+    all_times = [np.ravel(reg_spikes["times"])
+                 for pop_label, pop_spikes in spikes.iteritems()
+                 for reg_label, reg_spikes in pop_spikes.iteritems()]
+    all_times = np.concatenate(all_times) if len(all_times) else np.array([])
+    if all_times.size > 0:
+        t_start = np.min(all_times).item()
+        t_stop = np.max(all_times).item()
+    else:
+        t_start = np.inf
+        t_stop = -np.inf
     time = np.arange(t_start, t_stop+monitor_period, monitor_period)
     time = time[time <= t_stop]
     return time, t_start, t_stop
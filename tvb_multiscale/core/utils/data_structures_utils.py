@@ -2,13 +2,29 @@
 from collections import OrderedDict
 
 import numpy as np
+import xarray as xr
 from scipy.stats import describe
-from pandas import unique
+from pandas import unique, MultiIndex
 
 from tvb.contrib.scripts.utils.data_structures_utils import \
     ensure_list, flatten_list, is_integer, extract_integer_intervals
 
 
+def property_to_fun(property):
+    """This function returns the input property if it is callable,
+       or, otherwise, a function returning the property, for any arguments.
+       In the latter case, the property is also set as the _constant attribute of the function,
+       so that callers can retrieve it directly, without calling the function.
+       Note that dict properties are constants too, since they stand for
+       parameters' dictionaries or distributions' specifications, and not for lookup tables per node.
+    """
+    if callable(property):
+        return property
+    fun = lambda *args, **kwargs: property
+    fun._constant = property
+    return fun
+
+
 def flatten_neurons_inds_in_DataArray(data_array, neurons_dim_label="Neuron"):
     dims = list(data_array.dims)
     try:
@@ -21,6 +37,36 @@ def flatten_neurons_inds_in_DataArray(data_array, neurons_dim_label="Neuron"):
     return data_array
 
 
+def concat_DataArrays(data_arrays, index):
+    """This function concatenates xarray.DataArray instances along a new dimension.
+       If all DataArrays have the same dimensions, shape and (non multi-) indices, and no other coordinates,
+       there is nothing to align, and their values are stacked with a single numpy call.
+       Otherwise, it falls back to xarray.concat.
+       Arguments:
+        data_arrays: a list of xarray.DataArray instances
+        index: a pandas.Index of the new dimension, the name of which is the name of the new dimension
+       Returns:
+        the concatenated xarray.DataArray
+    """
+    if len(data_arrays) > 0:
+        first = data_arrays[0]
+        indexes = first.indexes
+        if set(first.coords) == set(indexes) and \
+                not any(isinstance(dim_index, MultiIndex) for dim_index in indexes.values()) and \
+                all(data_array.dims == first.dims and data_array.shape == first.shape and
+                    set(data_array.coords) == set(indexes) and
+                    all(data_array.indexes[dim].equals(dim_index) for dim, dim_index in indexes.items())
+                    for data_array in data_arrays[1:]):
+            coords = OrderedDict([(index.name, index)])
+            # Reuse the coordinates' variables, so that their dtypes are kept:
+            coords.update((dim, first.coords[dim].variable) for dim in indexes)
+            # Like xarray.concat, keep the name and attributes of the first DataArray:
+            return xr.DataArray(np.stack([data_array.values for data_array in data_arrays]),
+                                dims=(index.name,) + first.dims, coords=coords, attrs=first.attrs,
+                                name=first.name)
+    return xr.concat(data_arrays, dim=index)
+
+
 def filter_events(events, variables=None, times=None, exclude_times=[]):
     """This method will select/exclude part of the measured events, depending on user inputs
         Arguments:
@@ -1,11 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import numpy as np
-
 from tvb_multiscale.tvb_nest.interfaces.base import TVBNESTInterface
 from tvb_multiscale.tvb_nest.interfaces.builders.base import TVBNESTInterfaceBuilder
 from tvb_multiscale.tvb_nest.interfaces.models import RedWWexcIO
-from tvb_multiscale.core.spiking_models.builders.templates import scale_tvb_weight, tvb_delay
+from tvb_multiscale.core.spiking_models.builders.templates import scale_tvb_weight, bounded_tvb_delay
 
 
 class RedWWexcIOBuilder(TVBNESTInterfaceBuilder):
@@ -39,7 +37,7 @@ class RedWWexcIOBuilder(TVBNESTInterfaceBuilder):
                                 tvb_weights=self.tvb_weights, scale=self.global_coupling_scaling)
 
     def tvb_delay_fun(self, source_node, target_node):
-        return np.maximum(self.tvb_dt, tvb_delay(source_node, target_node, self.tvb_delays))
+        return bounded_tvb_delay(source_node, target_node, self.tvb_delays, self.tvb_dt)
 
     def _build_default_rate_tvb_to_nest_interfaces(self, connections, **kwargs):
         # For spike transmission from TVB to NEST devices as TVB proxy nodes with TVB delays:
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from functools import reduce
+from itertools import groupby
+from operator import add
 import numpy as np
 
 from tvb_multiscale.tvb_nest.config import CONFIGURED, initialize_logger
@@ -18,6 +21,22 @@ from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
 LOG = initialize_logger(__name__)
 
 
+def _hashable_delay(delay):
+    """Return a hashable key of a delay value or distribution dictionary."""
+    if isinstance(delay, dict):
+        return tuple(sorted(delay.items()))
+    return delay
+
+
+def _population_creation_key(model, params):
+    """Return a key of the model and parameters of a population, equal for populations that can be created
+       with a single NEST Create call, i.e., only if all parameters are scalars, or a unique key otherwise."""
+    params = params or {}
+    if all(np.isscalar(value) for value in params.values()):
+        return model, tuple(sorted(params.items()))
+    return object()
+
+
 class NESTModelBuilder(SpikingModelBuilder):
 
     """This is the base class of a NESTModelBuilder,
@@ -30,6 +49,9 @@ class NESTModelBuilder(SpikingModelBuilder):
     default_min_spiking_dt = CONFIGURED.NEST_MIN_DT
     default_min_delay = CONFIGURED.NEST_MIN_DT
     modules_to_install = []
+    # None stands for the default static_synapse:
+    static_synapse_models = (None, "static_synapse", "static_synapse_hom_w",
+                             "rate_connection_instantaneous", "rate_connection_delayed")
     _spiking_brain = NESTBrain()
 
     def __init__(self, tvb_simulator, nest_nodes_ids, nest_instance=None, config=CONFIGURED, logger=LOG):
@@ -41,6 +63,9 @@ class NESTModelBuilder(SpikingModelBuilder):
             self.nest_instance = load_nest(self.config, self.logger)
 
         self._spiking_brain = NESTBrain()
+        # A per instance copy of the modules to install, possibly set by subclasses at class level:
+        self.modules_to_install = list(type(self).modules_to_install)
+        self._asserted_synapse_models = {}
 
         # Setting NEST defaults from config
         self.default_population = {"model": self.config.DEFAULT_MODEL, "scale": 1, "params": {}, "nodes": None}
@@ -48,17 +73,12 @@ class NESTModelBuilder(SpikingModelBuilder):
         self.default_synaptic_weight_scaling = \
             lambda weight, n_cons: self.config.DEFAULT_SPIKING_SYNAPTIC_WEIGHT_SCALING(weight, n_cons)
 
-        self.default_populations_connection = dict(self.config.DEFAULT_CONNECTION)
-        self.default_populations_connection["delay"] = self.default_min_delay
-        self.default_populations_connection["nodes"] = None
-
-        self.default_nodes_connection = dict(self.config.DEFAULT_CONNECTION)
-        self.default_nodes_connection["delay"] = self.default_populations_connection["delay"]
-        self.default_nodes_connection.update({"source_nodes": None, "target_nodes": None})
-
-        self.default_devices_connection = dict(self.config.DEFAULT_CONNECTION)
-        self.default_devices_connection["delay"] = self.default_min_delay
-        self.default_devices_connection["nodes"] = None
+        # Build the defaults from the current configuration, which might have been modified by the user:
+        default_connection = self.config.DEFAULT_CONNECTION
+        self.default_populations_connection = dict(default_connection, delay=self.default_min_delay, nodes=None)
+        self.default_nodes_connection = dict(default_connection, delay=self.default_min_delay,
+                                             source_nodes=None, target_nodes=None)
+        self.default_devices_connection = dict(default_connection, delay=self.default_min_delay, nodes=None)
 
     def _configure_nest_kernel(self):
         self.nest_instance.ResetKernel()  # This will restart NEST!
@@ -67,41 +87,61 @@ class NESTModelBuilder(SpikingModelBuilder):
         self.nest_instance.set_verbosity(self.config.NEST_VERBOCITY)  # don't print all messages from NEST
         self.nest_instance.SetKernelStatus({"resolution": self.spiking_dt, "print_time": self.config.NEST_PRINT_TIME})
 
-    def _compile_install_nest_module(self, module):
+    @staticmethod
+    def _module_name_and_module(module):
+        """This method returns the name of the input NEST module, with and without the trailing "module"."""
+        if module.endswith("module"):
+            return module[:-6], module
+        return module, module + "module"
+
+    def _install_nest_module(self, module):
         """This method will try to install the input NEST module.
-           If it fails, it will try to compile it first and retry installing it.
            Arguments:
-            module: the name (string) of the module to be installed and, possibly, compiled
+            module: the name (string) of the module to be installed, including the trailing "module"
+           Returns:
+            True if the module has been installed, False otherwise
         """
-        if module[-6:] == "module":
-            module_name = module.split("module")[0]
-        else:
-            module_name = module
-            module = module + "module"
         try:
-            # Try to install it...
-            self.logger.info("Trying to install module %s..." % module)
+            self.logger.info("Trying to install module %s...", module)
             self.nest_instance.Install(module)
-            self.logger.info("DONE installing module %s!" % module)
         except:
             self.logger.info("FAILED! We need to first compile it!")
-            # ...unless we need to first compile it:
-            compile_modules(module_name, recompile=False, config=self.config)
-            # and now install it...
-            self.logger.info("Installing now module %s..." % module)
-            self.nest_instance.Install(module)
-            self.logger.info("DONE installing module %s!" % module)
+            return False
+        self.logger.info("DONE installing module %s!", module)
+        return True
+
+    def _compile_install_nest_module(self, module):
+        """This method will try to install the input NEST module.
+           If it fails, it will try to compile it first and retry installing it.
+           Arguments:
+            module: the name (string) of the module to be installed and, possibly, compiled
+        """
+        self.compile_install_nest_modules([module])
 
     def compile_install_nest_modules(self, modules_to_install):
         """This method will try to install the input NEST modules, also compiling them, if necessary.
+           All modules that fail to be installed are compiled together, before they are installed.
             Arguments:
              modules_to_install: a sequence (list, tuple) of the names (strings)
                                  of the modules to be installed and, possibly, compiled
         """
         if len(modules_to_install) > 0:
             self.logger.info("Starting to compile modules %s!" % str(modules_to_install))
-            while len(modules_to_install) > 0:
-                self._compile_install_nest_module(modules_to_install.pop())
+            # Try to install every module first, without modifying the input modules_to_install...
+            modules_to_compile = []
+            for module_to_install in list(modules_to_install):
+                module_name, module = self._module_name_and_module(module_to_install)
+                if not self._install_nest_module(module):
+                    modules_to_compile.append((module_name, module))
+            if len(modules_to_compile) > 0:
+                # ...unless we need to first compile some of them:
+                compile_modules([module_name for module_name, _ in modules_to_compile],
+                                recompile=False, config=self.config)
+                # and now install them...
+                for _, module in modules_to_compile:
+                    self.logger.info("Installing now module %s...", module)
+                    self.nest_instance.Install(module)
+                    self.logger.info("DONE installing module %s!", module)
 
     def confirm_compile_install_nest_models(self, models):
         """This method will try to confirm the existence of the input NEST models,
@@ -111,11 +151,10 @@ class NESTModelBuilder(SpikingModelBuilder):
             models: a sequence (list, tuple) of the names (strings)
                     of the models to be confirmed, and/or installed and, possibly, compiled
         """
-        nest_models = self.nest_instance.Models()
-        models = ensure_list(models)
-        for model in models:  # , module # zip(models, cycle(modules_to_install)):
-            if model not in nest_models:
-                self._compile_install_nest_module(model)
+        nest_models = set(self.nest_instance.Models())
+        # , module # zip(models, cycle(modules_to_install)):
+        self.compile_install_nest_modules(
+            list(dict.fromkeys([model for model in ensure_list(models) if model not in nest_models])))
 
     def configure(self):
         self._configure_nest_kernel()
@@ -138,6 +177,37 @@ class NESTModelBuilder(SpikingModelBuilder):
         return NESTPopulation(self.nest_instance.Create(model, int(np.round(size)), params=params),
                               label, model, self.nest_instance)
 
+    def build_spiking_populations(self, populations, *args, **kwargs):
+        """This method builds several NESTPopulation instances, in the given order.
+           Consecutive populations of the same model and scalar parameters are created with a single NEST Create
+           call, the neurons of which are split to the populations, so that every population gets the same neurons
+           as if they were created one at a time.
+           Arguments:
+            populations: a sequence of (label, model, size, params) tuples,
+                         with the arguments of build_spiking_population for every population
+           Returns:
+            a list of NESTPopulation class instances, in the order of the input populations
+        """
+        if type(self).build_spiking_population is not NESTModelBuilder.build_spiking_population:
+            # Subclasses that build their populations differently are respected:
+            return super(NESTModelBuilder, self).build_spiking_populations(populations, *args, **kwargs)
+        nest_populations = []
+        creation_key = lambda population: _population_creation_key(population[1], population[3])
+        for _, group in groupby(populations, key=creation_key):
+            group = [(label, model, int(np.round(size)), params) for label, model, size, params in group]
+            if len(group) == 1:
+                nest_populations.append(self.build_spiking_population(*group[0]))
+                continue
+            model, params = group[0][1], group[0][3]
+            neurons = self.nest_instance.Create(model, sum([size for _, _, size, _ in group]), params=params)
+            # Split the created neurons to the populations of the group:
+            offset = 0
+            for label, _, size, _ in group:
+                nest_populations.append(NESTPopulation(neurons[offset:offset + size],
+                                                       label, model, self.nest_instance))
+                offset += size
+        return nest_populations
+
     @property
     def min_delay(self):
         try:
@@ -168,42 +238,19 @@ class NESTModelBuilder(SpikingModelBuilder):
 
     def _assert_synapse_model(self, synapse_model, delay):
         """A method to assert the synapse_model (default = "static_synapse), in combination with the delay value.
-           It is based on respecting the fact that rate_connection_instantaneous requires a delay of zero.
+           See _assert_synapse_model_and_delay.
+           Returns:
+            the asserted synapse_model
         """
-        if synapse_model is None:
-            synapse_model = "static_synapse"
-        if synapse_model.find("rate") > -1:
-            if synapse_model == "rate_connection_instantaneous" and delay != 0.0:
-                raise_value_error("Coupling neurons with rate_connection_instantaneous synapse "
-                                  "and delay = %s != 0.0 is not possible!" % str(delay))
-            elif self._get_min_delay(delay) == 0.0 and synapse_model == "rate_connection_delayed":
-                raise_value_error("Coupling neurons with rate_connection_delayed synapse "
-                                  "and delay = %s <= 0.0 is not possible!" % str(delay))
-            elif self._get_max_delay(delay) == 0.0:
-                return "rate_connection_instantaneous"
-            else:
-                return "rate_connection_delayed"
-        else:
-            return synapse_model
+        return self._assert_synapse_model_and_delay(synapse_model, delay)[0]
 
     def _assert_delay(self, delay, synapse_model="static_synapse"):
         """A method to assert the delay value, in combination with the synapse_model.
-           It is based on respecting the minimum possible delay of the network,
-           as well as the fact that rate_connection_instantaneous requires a delay of zero.
+           See _assert_synapse_model_and_delay.
+           Returns:
+            the asserted delay
         """
-        if synapse_model.find("rate") > -1:
-            if synapse_model == "rate_connection_instantaneous" and delay != 0.0:
-                raise_value_error("Coupling neurons with rate_connection_instantaneous synapse "
-                                  "and delay = %s != 0.0 is not possible!" % str(delay))
-            elif synapse_model == "rate_connection_delayed" and self._get_min_delay(delay) <= 0.0:
-                raise_value_error("Coupling neurons with rate_connection_delayed synapse "
-                                  "and delay = %s <= 0.0 is not possible!" % str(delay))
-            elif self._get_min_delay(delay) < 0.0:
-                raise_value_error("Coupling rate neurons with negative delay = %s < 0.0 is not possible!" % str(delay))
-        elif self._get_min_delay(delay) < self.spiking_dt:
-            raise_value_error("Coupling spiking neurons with delay = %s < NEST integration step = %f is not possible!:"
-                              "\n" % (str(delay), self.spiking_dt))
-        return delay
+        return self._assert_synapse_model_and_delay(synapse_model, delay)[1]
 
     def _prepare_conn_spec(self, pop_src, pop_trg, conn_spec):
         return create_conn_spec(n_src=pop_src.number_of_neurons, n_trg=pop_trg.number_of_neurons,
@@ -227,16 +274,53 @@ class NESTModelBuilder(SpikingModelBuilder):
         syn_spec.update(params)
         return syn_spec
 
+    def _assert_synapse_model_and_delay(self, synapse_model, delay):
+        """A method to assert the synapse_model (default = "static_synapse) and the delay value together,
+           getting the minimum delay and checking for a rate synapse model only once.
+           It is based on respecting the minimum possible delay of the network,
+           as well as the fact that rate_connection_instantaneous requires a delay of zero.
+           The result is memoized for every combination of synapse_model, delay and spiking_dt already asserted.
+           Returns:
+            the asserted synapse_model and delay
+        """
+        key = (synapse_model, _hashable_delay(delay), self.spiking_dt)
+        try:
+            return self._asserted_synapse_models[key], delay
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable delay, so we cannot memoize:
+            key = None
+        asserted_synapse_model = "static_synapse" if synapse_model is None else synapse_model
+        min_delay = self._get_min_delay(delay)
+        if asserted_synapse_model.find("rate") > -1:
+            if asserted_synapse_model == "rate_connection_instantaneous" and delay != 0.0:
+                raise_value_error("Coupling neurons with rate_connection_instantaneous synapse "
+                                  "and delay = %s != 0.0 is not possible!" % str(delay))
+            if min_delay <= 0.0 and asserted_synapse_model == "rate_connection_delayed":
+                raise_value_error("Coupling neurons with rate_connection_delayed synapse "
+                                  "and delay = %s <= 0.0 is not possible!" % str(delay))
+            if self._get_max_delay(delay) == 0.0:
+                asserted_synapse_model = "rate_connection_instantaneous"
+            else:
+                asserted_synapse_model = "rate_connection_delayed"
+        if asserted_synapse_model != "rate_connection_instantaneous" and min_delay < self.spiking_dt:
+            raise_value_error("Coupling spiking neurons with delay = %s < NEST integration step = %f is not possible!:"
+                              "\n" % (str(delay), self.spiking_dt))
+        if key is not None:
+            self._asserted_synapse_models[key] = asserted_synapse_model
+        return asserted_synapse_model, delay
+
     def _prepare_syn_spec(self, syn_spec):
-        # Prepare the parameters of synapses:
-        syn_spec["synapse_model"] = self._assert_synapse_model(syn_spec.get("synapse_model",
-                                                                            syn_spec.get("model", "static_synapse")),
-                                                               syn_spec["delay"])
+        # Prepare the parameters of synapses on a copy,
+        # since the same syn_spec is shared by all the populations' pairs of a connection:
+        syn_spec = dict(syn_spec)
+        syn_spec["synapse_model"] = \
+            self._assert_synapse_model(syn_spec.get("synapse_model", syn_spec.get("model", "static_synapse")),
+                                       syn_spec["delay"])
         # Scale the synaptic weight with respect to the total number of connections between the two populations:
         if syn_spec["synapse_model"] == "rate_connection_instantaneous":
             del syn_spec["delay"]  # For instantaneous rate connections
-        else:
-            syn_spec["delay"] = self._assert_delay(syn_spec["delay"])
         return syn_spec
 
     def connect_two_populations(self, pop_src, src_inds_fun, pop_trg, trg_inds_fun, conn_spec, syn_spec):
@@ -253,15 +337,67 @@ class NESTModelBuilder(SpikingModelBuilder):
         """
         # Prepare the parameters of connectivity:
         conn_spec = self._prepare_conn_spec(pop_src, pop_trg, conn_spec)
+        # Get the source and target neurons once for all synaptic receptors:
+        self._connect_neurons(get_populations_neurons(pop_src, src_inds_fun),
+                              get_populations_neurons(pop_trg, trg_inds_fun),
+                              conn_spec, syn_spec)
+
+    def connect_populations(self, sources, src_inds_fun, targets, trg_inds_fun, conn_spec, syn_spec):
+        """Method to connect every combination of source and target NESTPopulation instances
+           with the same connectivity and synapse parameters.
+           All to all connections among several distinct populations are created with a single NEST Connect
+           (per synaptic receptor), among the union of their neurons, which results to the same connections.
+           Arguments:
+            sources: a sequence of the source NESTPopulation instances of the connection
+            src_inds_fun: a function that selects a subset of the souce populations' neurons
+            targets: a sequence of the target NESTPopulation instances of the connection
+            trg_inds_fun: a function that selects a subset of the target populations' neurons
+            conn_spec: a dict of parameters of the connectivity pattern among the neurons of the populations,
+                       excluding weight and delay ones
+            syn_spec: a dict of parameters of the synapses among the neurons of the populations,
+                      including weight, delay and synaptic receptor type ones
+        """
+        if len(sources) * len(targets) > 1 \
+                and conn_spec.get("rule", self.config.DEFAULT_CONNECTION["conn_spec"]["rule"]) == "all_to_all" \
+                and len(set(map(id, sources))) == len(sources) and len(set(map(id, targets))) == len(targets):
+            src_neurons = [get_populations_neurons(pop_src, src_inds_fun) for pop_src in sources]
+            trg_neurons = [get_populations_neurons(pop_trg, trg_inds_fun) for pop_trg in targets]
+            node_collection = getattr(self.nest_instance, "NodeCollection", None)
+            if node_collection is not None \
+                    and all(isinstance(neurons, node_collection) for neurons in src_neurons + trg_neurons):
+                # NEST NodeCollections of distinct populations can be concatenated...
+                src_neurons = reduce(add, src_neurons)
+                trg_neurons = reduce(add, trg_neurons)
+                conn_spec = create_conn_spec(n_src=len(src_neurons), n_trg=len(trg_neurons),
+                                             config=self.config, **conn_spec)[0]
+                self._connect_neurons(src_neurons, trg_neurons, conn_spec, syn_spec)
+                return
+        # ...otherwise, e.g., if the neurons' selection functions do not return NodeCollections,
+        # connect every pair of source and target populations separately:
+        super(NESTModelBuilder, self).connect_populations(sources, src_inds_fun, targets, trg_inds_fun,
+                                                          conn_spec, syn_spec)
+
+    def _connect_neurons(self, src_neurons, trg_neurons, conn_spec, syn_spec):
         # Prepare the parameters of the synapse:
         syn_spec = self._prepare_syn_spec(syn_spec)
         # We might create the same connection multiple times for different synaptic receptors...
         receptors = ensure_list(syn_spec["receptor_type"])
-        for receptor in receptors:
-            syn_spec["receptor_type"] = receptor
-            self.nest_instance.Connect(get_populations_neurons(pop_src, src_inds_fun),
-                                       get_populations_neurons(pop_trg, trg_inds_fun),
-                                       conn_spec, syn_spec)
+        if len(receptors) == 1:
+            syn_spec["receptor_type"] = receptors[0]
+            self.nest_instance.Connect(src_neurons, trg_neurons, conn_spec, syn_spec)
+        elif conn_spec.get("rule", self.config.DEFAULT_CONNECTION["conn_spec"]["rule"]) \
+                in ["all_to_all", "one_to_one"] and hasattr(self.nest_instance, "CollocatedSynapses"):
+            # ...in which case, for deterministic connectivity rules,
+            # we create all of them with a single call, if this NEST version allows it...
+            self.nest_instance.Connect(src_neurons, trg_neurons, conn_spec,
+                                       self.nest_instance.CollocatedSynapses(
+                                           *[dict(syn_spec, receptor_type=receptor) for receptor in receptors]))
+        else:
+            # ...or, otherwise, one receptor at a time,
+            # so that probabilistic connectivity rules are drawn independently for each receptor:
+            for receptor in receptors:
+                self.nest_instance.Connect(src_neurons, trg_neurons, conn_spec,
+                                           dict(syn_spec, receptor_type=receptor))
 
     def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
         """This methods builds a NESTRegionNode instance,
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from collections import ChainMap
+
 import numpy as np
 
 from tvb_multiscale.tvb_nest.config import CONFIGURED
@@ -119,24 +121,24 @@ class WWDeco2013Builder(DefaultExcIOInhIMultisynapseBuilder):
             "tau_decay_NMDA": tau_decay_NMDA, "tau_rise_NMDA": tau_rise_NMDA,
             "s_AMPA_ext_max": N_E * np.ones((self.number_of_nodes,)).astype("f")
         }
-        params_E = dict(common_params)
-        params_E.update({
+        # The populations' specific parameters override the common ones, which are not copied,
+        # because param_fun builds a new dict per node anyway:
+        params_E = ChainMap({
             "C_m": C_m_ex, "g_L": g_L_ex, "t_ref": t_ref_ex,
             "g_AMPA_ext": g_AMPA_ext_ex, "g_AMPA": g_AMPA_rec_ex,
             "g_NMDA": g_NMDA_ex, "g_GABA_A": g_GABA_ex,
             "w_E": w_EE, "w_I": w_IE,
             "N_E": N_E, "N_I": N_I
-        })
+        }, common_params)
         self.params_E = lambda node_index: self.param_fun(node_index, params_E,
                                                           weight=self.global_coupling_scaling)
-        params_I = dict(common_params)
-        params_I.update({
+        params_I = ChainMap({
             "C_m": C_m_in, "g_L": g_L_in, "t_ref": t_ref_in,
             "g_AMPA_ext": g_AMPA_ext_in, "g_AMPA": g_AMPA_rec_in,
             "g_NMDA": g_NMDA_in, "g_GABA_A": g_GABA_in,
             "w_E": 1.0, "w_I": 1.0,
             "N_E": N_E, "N_I": N_I
-        })
+        }, common_params)
         self.params_I = lambda node_index: self.param_fun(node_index, params_I,
                                                           weight=self.lamda * self.global_coupling_scaling)
 
@@ -147,10 +149,9 @@ class WWDeco2013Builder(DefaultExcIOInhIMultisynapseBuilder):
                        "s_AMPA", "x_NMDA", "s_NMDA", "s_GABA",
                        "I_AMPA", "I_NMDA", "I_GABA", "I_L", "I_e",
                        "spikes_exc", "spikes_inh"]
-        for i_node in range(self.number_of_nodes):
-            record_from.append("s_AMPA_ext_%d" % i_node)
-            record_from.append("I_AMPA_ext_%d" % i_node)
-            record_from.append("spikes_exc_ext_%d" % i_node)
+        record_from.extend(["%s_%d" % (var, i_node)
+                            for i_node in range(self.number_of_nodes)
+                            for var in ("s_AMPA_ext", "I_AMPA_ext", "spikes_exc_ext")])
         params = dict(self.config.NEST_OUTPUT_DEVICES_PARAMS_DEF["multimeter"])
         params["record_from"] = record_from
         self.multimeter["params"] = params
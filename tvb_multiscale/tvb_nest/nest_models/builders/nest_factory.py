@@ -4,8 +4,6 @@ import os
 import sys
 import shutil
 
-import numpy as np
-
 from tvb_multiscale.tvb_nest.config import CONFIGURED, initialize_logger
 from tvb_multiscale.tvb_nest.nest_models.devices import NESTInputDeviceDict, NESTOutputDeviceDict
 from tvb_multiscale.core.spiking_models.builders.factory import log_path
@@ -18,6 +16,11 @@ from tvb.contrib.scripts.utils.file_utils import safe_makedirs
 LOG = initialize_logger(__name__)
 
 
+# The names of the available input and output NEST devices' models:
+_INPUT_DEVICES_MODELS = frozenset(NESTInputDeviceDict)
+_OUTPUT_DEVICES_MODELS = frozenset(NESTOutputDeviceDict)
+
+
 #TODO: Find a better way to abstract between nest_factory and factory!
 
 
@@ -61,6 +64,15 @@ def load_nest(config=CONFIGURED, logger=LOG):
     return nest
 
 
+def _copy_file_if_changed(src, dst):
+    """Function to copy file src to dst,
+       unless dst already has the same size as src and has been modified after it."""
+    if os.path.isfile(dst) and \
+            os.path.getsize(dst) == os.path.getsize(src) and os.path.getmtime(dst) >= os.path.getmtime(src):
+        return
+    shutil.copyfile(src, dst)
+
+
 def compile_modules(modules, recompile=False, config=CONFIGURED, logger=LOG):
     """Function to compile NEST modules.
        Arguments:
@@ -103,10 +115,10 @@ def compile_modules(modules, recompile=False, config=CONFIGURED, logger=LOG):
             logger.info("Installing precompiled module %s..." % module)
             success_message = "DONE installing precompiled module %s!" % module
             # Just copy the .h, .so, and .dylib files to the appropriate NEST build paths:
-            shutil.copyfile(solib_file, installed_solib_file)
-            shutil.copyfile(solib_file, installed_dylib_file)
+            _copy_file_if_changed(solib_file, installed_solib_file)
+            _copy_file_if_changed(solib_file, installed_dylib_file)
             safe_makedirs(include_path)
-            shutil.copyfile(os.path.join(module_bld_dir, modulemodule + ".h"), installed_h_file)
+            _copy_file_if_changed(os.path.join(module_bld_dir, modulemodule + ".h"), installed_h_file)
         if os.path.isfile(installed_solib_file) and \
                 os.path.isfile(installed_dylib_file) and \
                     os.path.isfile(installed_h_file):
@@ -131,6 +143,71 @@ def get_populations_neurons(population, inds_fun=None):
     return inds_fun(population._population)
 
 
+def _one_to_one_conn_spec(conn_spec, get, n_src, n_trg, src_is_trg, p_def):
+    # TODO: test whether there is an error
+    # if Nsrc != Ntrg in this case
+    # and if src_is_trg and autapses or multapses play a role
+    return conn_spec, min(n_src, n_trg)
+
+
+def _fixed_total_number_conn_spec(conn_spec, get, n_src, n_trg, src_is_trg, p_def):
+    N = get("N")
+    if N is None:
+        # Assume all to all if N is not given:
+        N = n_src * n_trg
+        p = get("p")
+        if p is not None:
+            # ...prune to end up to connection probability p if p is given
+            N = int(round(p * N))
+    conn_spec['N'] = N
+    return conn_spec, N
+
+
+def _fixed_indegree_conn_spec(conn_spec, get, n_src, n_trg, src_is_trg, p_def):
+    indegree = get("indegree")
+    if indegree is None:
+        # Compute indegree following connection probability p if not given
+        p = get("p")
+        if p is None:
+            p = p_def
+        indegree = int(round(p * n_src))
+    conn_spec['indegree'] = indegree
+    return conn_spec, indegree * n_trg
+
+
+def _fixed_outdegree_conn_spec(conn_spec, get, n_src, n_trg, src_is_trg, p_def):
+    outdegree = get("outdegree")
+    if outdegree is None:
+        # Compute outdegree following connection probability p if not given
+        p = get("p")
+        if p is None:
+            p = p_def
+        outdegree = int(round(p * n_trg))
+    conn_spec['outdegree'] = outdegree
+    return conn_spec, outdegree * n_src
+
+
+def _all_to_all_conn_spec(conn_spec, get, n_src, n_trg, src_is_trg, p_def):
+    Nall = n_src * n_trg
+    if src_is_trg and conn_spec["allow_autapses"] is False:
+        Nall -= n_src
+    if conn_spec["rule"] == 'pairwise_bernoulli':
+        p = get("p")
+        if p is None:
+            p = p_def
+        conn_spec['p'] = p
+        return conn_spec, int(round(p * Nall))
+    else:  # assuming rule == 'all_to_all':
+        return conn_spec, Nall
+
+
+# Functions to complete a conn_spec and compute its number of connections, per connectivity rule:
+_CONN_SPEC_RULES = {'one_to_one': _one_to_one_conn_spec,
+                    'fixed_total_number': _fixed_total_number_conn_spec,
+                    'fixed_indegree': _fixed_indegree_conn_spec,
+                    'fixed_outdegree': _fixed_outdegree_conn_spec}
+
+
 def create_conn_spec(n_src=1, n_trg=1, src_is_trg=False, config=CONFIGURED, **kwargs):
     """This function returns a conn_spec dictionary and the expected/accurate number of total connections.
        Arguments:
@@ -139,73 +216,43 @@ def create_conn_spec(n_src=1, n_trg=1, src_is_trg=False, config=CONFIGURED, **kw
         src_is_trg: a (bool) flag to determine if the source and target populations are the same one. Default = False.
         config: configuration class instance. Default: imported default CONFIGURED object.
     """
-    conn_spec = dict(config.DEFAULT_CONNECTION["conn_spec"])
-    P_DEF = conn_spec["p"]
-    conn_spec.update(kwargs)
-    rule = conn_spec["rule"]
-    p = conn_spec["p"]
-    N = conn_spec["N"]
-    autapses = conn_spec["allow_autapses"]
-    multapses = conn_spec["allow_multapses"]
-    indegree = conn_spec["indegree"]
-    outdegree = conn_spec["outdegree"]
+    default_conn_spec = config.DEFAULT_CONNECTION["conn_spec"]
+
+    def get(key):
+        # User inputs take precedence over the default conn_spec:
+        return kwargs[key] if key in kwargs else default_conn_spec[key]
+
+    rule = get("rule")
     conn_spec = {
         'rule': rule,
-        'allow_autapses': autapses,  # self-connections flag
-        'allow_multapses': multapses  # multiple connections per neurons' pairs flag
+        'allow_autapses': get("allow_autapses"),  # self-connections flag
+        'allow_multapses': get("allow_multapses")  # multiple connections per neurons' pairs flag
     }
-    if rule == 'one_to_one':
-        # TODO: test whether there is an error
-        # if Nsrc != Ntrg in this case
-        # and if src_is_trg and autapses or multapses play a role
-        return conn_spec, np.minimum(n_src, n_trg)
-    elif rule == 'fixed_total_number':
-        if N is None:
-            # Assume all to all if N is not given:
-            N = n_src * n_trg
-            if p is not None:
-                # ...prune to end up to connection probability p if p is given
-                N = int(np.round(p * N))
-        conn_spec['N'] = N
-        return conn_spec, N
-    elif rule == 'fixed_indegree':
-        if indegree is None:
-            # Compute indegree following connection probability p if not given
-            if p is None:
-                p = P_DEF
-            indegree = int(np.round(p * n_src))
-        conn_spec['indegree'] = indegree
-        return conn_spec, indegree * n_trg
-    elif rule == 'fixed_outdegree':
-        if outdegree is None:
-            # Compute outdegree following connection probability p if not given
-            if p is None:
-                p = P_DEF
-            outdegree = int(np.round(p * n_trg))
-        conn_spec['outdegree'] = outdegree
-        return conn_spec, outdegree * n_src
-    else:
-        Nall = n_src * n_trg
-        if src_is_trg and autapses is False:
-            Nall -= n_src
-        if rule == 'pairwise_bernoulli':
-            if p is None:
-                p = P_DEF
-            conn_spec['p'] = p
-            return conn_spec, int(np.round(p * Nall))
-        else:  # assuming rule == 'all_to_all':
-            return conn_spec, Nall
+    # Rules other than the ones of _CONN_SPEC_RULES are either 'pairwise_bernoulli' or assumed to be 'all_to_all':
+    return _CONN_SPEC_RULES.get(rule, _all_to_all_conn_spec)(conn_spec, get, n_src, n_trg, src_is_trg,
+                                                             default_conn_spec["p"])
+
+
+# Devices' models the creation of which might need to be retried once:
+_RETRY_CREATE_DEVICES_MODELS = frozenset(["inhomogeneous_poisson_generator"])
+# ...and the ones for which it has already been retried in this process:
+_RETRIED_DEVICES_MODELS = set()
+
+
+def _get_nest_error_type(nest_instance):
+    """Function to return the exception class NEST raises for kernel errors, if it is available."""
+    return getattr(getattr(nest_instance, "kernel", None), "NESTError", Exception)
+
+# Aliases of devices' models to the NEST models they are created from:
+_DEVICES_MODELS_ALIASES = {"spike_multimeter": "multimeter"}
 
 
 def device_to_dev_model(device):
     """Method to return a multimeter device for a spike_multimeter model name."""
-    if device == "spike_multimeter":
-        return "multimeter"
-    else:
-        return device
+    return _DEVICES_MODELS_ALIASES.get(device, device)
 
 
-def create_device(device_model, params=None, config=CONFIGURED, nest_instance=None):
+def create_device(device_model, params=None, config=CONFIGURED, nest_instance=None, number_of_devices=1):
     """Method to create a NESTDevice.
        Arguments:
         device_model: name (string) of the device model
@@ -213,8 +260,10 @@ def create_device(device_model, params=None, config=CONFIGURED, nest_instance=No
         config: configuration class instance. Default: imported default CONFIGURED object.
         nest_instance: the NEST instance.
                        Default = None, in which case we are going to load one, and also return it in the output
+        number_of_devices: number (int) of identical devices to create with a single NEST Create call. Default = 1.
        Returns:
-        the NESTDevice class, and optionally, the NEST instance if it is loaded here.
+        the NESTDevice class, or a list of number_of_devices NESTDevice classes if number_of_devices > 1,
+        and optionally, the NEST instance if it is loaded here.
     """
     if nest_instance is None:
         nest_instance = load_nest(config=config)
@@ -223,10 +272,10 @@ def create_device(device_model, params=None, config=CONFIGURED, nest_instance=No
         return_nest = False
     # Assert the model name...
     device_model = device_to_dev_model(device_model)
-    if device_model in NESTInputDeviceDict.keys():
+    if device_model in _INPUT_DEVICES_MODELS:
         devices_dict = NESTInputDeviceDict
         default_params_dict = config.NEST_INPUT_DEVICES_PARAMS_DEF
-    elif device_model in NESTOutputDeviceDict.keys():
+    elif device_model in _OUTPUT_DEVICES_MODELS:
         devices_dict = NESTOutputDeviceDict
         default_params_dict = config.NEST_OUTPUT_DEVICES_PARAMS_DEF
     else:
@@ -237,14 +286,26 @@ def create_device(device_model, params=None, config=CONFIGURED, nest_instance=No
     default_params = dict(default_params_dict.get(device_model, {}))
     if isinstance(params, dict) and len(params) > 0:
         default_params.update(params)
-    # TODO: a better solution for the strange error with inhomogeneous poisson generator
     label = default_params.pop("label", "")
-    try:
-        nest_device_id = nest_instance.Create(device_model, params=default_params)
-    except:
-        warning("Using temporary hack for creating successive %s devices!" % device_model)
-        nest_device_id = nest_instance.Create(device_model, params=default_params)
-    nest_device = devices_dict[device_model](nest_device_id, nest_instance, label=label)
+    if device_model in _RETRY_CREATE_DEVICES_MODELS:
+        # TODO: a better solution for the strange error with inhomogeneous poisson generator
+        try:
+            nest_device_id = nest_instance.Create(device_model, number_of_devices, params=default_params)
+        except _get_nest_error_type(nest_instance) as e:
+            if device_model not in _RETRIED_DEVICES_MODELS:
+                # Warn only the first time this happens for this model:
+                _RETRIED_DEVICES_MODELS.add(device_model)
+                warning("Using temporary hack for creating successive %s devices, after error:\n%s"
+                        % (device_model, str(e)))
+            nest_device_id = nest_instance.Create(device_model, number_of_devices, params=default_params)
+    else:
+        nest_device_id = nest_instance.Create(device_model, number_of_devices, params=default_params)
+    if number_of_devices == 1:
+        nest_device = devices_dict[device_model](nest_device_id, nest_instance, label=label)
+    else:
+        # Split the created NEST devices to distinct NESTDevice classes:
+        nest_device = [devices_dict[device_model](nest_device_id[i_dev:i_dev + 1], nest_instance, label=label)
+                       for i_dev in range(number_of_devices)]
     if return_nest:
         return nest_device, nest_instance
     else: